@@ -1,7 +1,13 @@
 #!/usr/bin/env python3
 """Entry point for running proms-mcp as a module."""
 
-from .server import main
+
+def main() -> None:
+    """Run the server, importing it only when actually started."""
+    from .server import main as server_main
+
+    server_main()
+
 
 if __name__ == "__main__":
     main()
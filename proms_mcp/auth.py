@@ -3,6 +3,8 @@
 Contains authentication models and OpenShift user info based token verification.
 """
 
+import asyncio
+import functools
 import hashlib
 import os
 import ssl
@@ -13,7 +15,6 @@ from pathlib import Path
 
 import httpx
 import structlog
-from asyncache import cached  # type: ignore[import-untyped]
 from cachetools import TTLCache
 from fastmcp.server.auth import TokenVerifier
 from fastmcp.server.auth.auth import AccessToken
@@ -21,11 +22,35 @@ from fastmcp.server.auth.auth import AccessToken
 logger = structlog.get_logger()
 
 # Auth cache TTL from environment (default: 2 minutes, 0 = disable cache)
-_AUTH_CACHE_TTL_SECONDS = int(os.getenv("AUTH_CACHE_TTL_SECONDS", "120"))
+_AUTH_CACHE_TTL_SECONDS: int
 
 # Authentication cache: configurable TTL, max 1000 entries, thread-safe
-_auth_cache: TTLCache[str, "User | None"] = TTLCache(
-    maxsize=1000, ttl=_AUTH_CACHE_TTL_SECONDS
+_auth_cache: TTLCache[str, "User"]
+
+
+def _rebuild_auth_cache(ttl: int | None = None) -> None:
+    """Replace the authentication cache with an empty one.
+
+    Args:
+        ttl: Cache TTL in seconds; read from AUTH_CACHE_TTL_SECONDS when None
+    """
+    global _AUTH_CACHE_TTL_SECONDS, _auth_cache
+    if ttl is None:
+        ttl = int(os.getenv("AUTH_CACHE_TTL_SECONDS", "120"))
+    _AUTH_CACHE_TTL_SECONDS = ttl
+    _auth_cache = TTLCache(maxsize=1000, ttl=ttl)
+
+
+_rebuild_auth_cache()
+
+# Negative cache TTL for rejected tokens (default: 30 seconds, 0 = disable)
+_AUTH_NEGATIVE_CACHE_TTL_SECONDS = int(
+    os.getenv("AUTH_NEGATIVE_CACHE_TTL_SECONDS", "30")
+)
+
+# Tokens the API server rejected, so retries with a bad token stay local
+_auth_negative_cache: TTLCache[str, None] = TTLCache(
+    maxsize=1000, ttl=_AUTH_NEGATIVE_CACHE_TTL_SECONDS
 )
 
 
@@ -34,9 +59,38 @@ def _cache_key(token: str) -> str:
     return hashlib.sha256(token.encode()).hexdigest()
 
 
+_IN_CLUSTER_CA_PATH = "/var/run/secrets/kubernetes.io/serviceaccount/ca.crt"
+
+
+# Timeout for user info requests; also how long a client retired by a CA
+# rotation is kept open so its in-flight lookups can finish
+_HTTP_TIMEOUT_SECONDS = 10.0
+
+
+@functools.lru_cache(maxsize=8)
+def _ssl_context(ca_cert_path: str, ca_digest: str | None = None) -> ssl.SSLContext:
+    """SSL context for a CA certificate file, shared by every verifier using it.
+
+    Keyed on the file's content digest as well, so a rotated CA gets a new context.
+    """
+    return ssl.create_default_context(cafile=ca_cert_path)
+
+
+@functools.lru_cache(maxsize=1)
+def _detect_in_cluster_ca() -> str | None:
+    """Path of the in-cluster service account CA, if mounted.
+
+    Probed once per process; the mount doesn't appear or vanish at runtime.
+    """
+    if Path(_IN_CLUSTER_CA_PATH).exists():
+        return _IN_CLUSTER_CA_PATH
+    return None
+
+
 def clear_auth_cache() -> None:
-    """Clear the authentication cache. Useful for testing."""
+    """Clear the authentication caches. Useful for testing."""
     _auth_cache.clear()
+    _auth_negative_cache.clear()
 
 
 def get_auth_cache_size() -> int:
@@ -51,9 +105,12 @@ class AuthMode(Enum):
     ACTIVE = "active"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class User:
-    """User information from authentication."""
+    """User information from authentication.
+
+    Immutable so cached instances can be shared safely between requests.
+    """
 
     username: str
     uid: str
@@ -87,7 +144,19 @@ class OpenShiftUserVerifier(TokenVerifier):
             required_scopes=required_scopes or ["read:data"],
         )
         self.api_url = api_url.rstrip("/")
+        self._userinfo_url = f"{self.api_url}/apis/user.openshift.io/v1/users/~"
         self.ca_cert_path = self._resolve_ca_cert_path(ca_cert_path)
+        self._http_client: httpx.AsyncClient | None = None
+        # CA file mtime and content digest the current client was built with.
+        # The mtime is only a cheap pre-check: projected service account volumes
+        # rewrite ca.crt on every token refresh without changing its content.
+        self._ca_mtime_ns: int | None = None
+        self._ca_digest: str | None = None
+        # Clients replaced after a CA rotation, closed once a grace period ends
+        self._retiring: dict[asyncio.Task[None], httpx.AsyncClient] = {}
+        # In-flight validations keyed like the auth cache, so concurrent
+        # requests with the same token share a single API call
+        self._pending: dict[str, asyncio.Task[User | None]] = {}
 
     def _resolve_ca_cert_path(self, ca_cert_path: str | None) -> str | None:
         """Resolve CA certificate path with auto-detection for in-cluster usage.
@@ -113,8 +182,8 @@ class OpenShiftUserVerifier(TokenVerifier):
                 raise ValueError(f"CA certificate file not found: {ca_cert_path}")
 
         # Auto-detect in-cluster CA certificate
-        in_cluster_ca = "/var/run/secrets/kubernetes.io/serviceaccount/ca.crt"
-        if Path(in_cluster_ca).exists():
+        in_cluster_ca = _detect_in_cluster_ca()
+        if in_cluster_ca is not None:
             logger.info("Using in-cluster CA certificate", path=in_cluster_ca)
             return in_cluster_ca
 
@@ -122,6 +191,83 @@ class OpenShiftUserVerifier(TokenVerifier):
         logger.info("Using system CA certificate store for TLS verification")
         return None
 
+    def _ca_cert_digest(self) -> str | None:
+        """Content digest of the CA certificate file, if one is configured.
+
+        The file is only re-read when its mtime changed since the last check.
+        """
+        if not self.ca_cert_path:
+            return None
+        path = Path(self.ca_cert_path)
+        try:
+            mtime_ns = path.stat().st_mtime_ns
+            if mtime_ns != self._ca_mtime_ns or self._ca_digest is None:
+                self._ca_digest = hashlib.sha256(path.read_bytes()).hexdigest()
+                self._ca_mtime_ns = mtime_ns
+        except OSError:
+            # Keep using the loaded bundle while the file is being replaced
+            pass
+        return self._ca_digest
+
+    def _retire_http_client(self, client: httpx.AsyncClient) -> None:
+        """Close a replaced client once requests already using it have finished."""
+
+        async def close_after_grace_period() -> None:
+            await asyncio.sleep(_HTTP_TIMEOUT_SECONDS)
+            await client.aclose()
+
+        task = asyncio.get_running_loop().create_task(close_after_grace_period())
+        self._retiring[task] = client
+        task.add_done_callback(lambda _: self._retiring.pop(task, None))
+
+    def _get_http_client(self) -> httpx.AsyncClient:
+        """Return the shared HTTP client, creating it on first use.
+
+        A single client keeps connections to the API server alive between
+        token validations instead of opening a new TLS session for each one.
+        The client is rebuilt when the CA certificate file changes, so a
+        rotated in-cluster CA is picked up without a restart.
+        """
+        client_digest = self._ca_digest
+        ca_digest = self._ca_cert_digest()
+        if self._http_client is not None and ca_digest != client_digest:
+            logger.info("CA certificate changed, rebuilding HTTP client")
+            self._retire_http_client(self._http_client)
+            self._http_client = None
+
+        if self._http_client is None:
+            # Configure HTTP client with proper CA certificate verification
+            if self.ca_cert_path:
+                # Use custom CA certificate, parsed once per path and content
+                verify: ssl.SSLContext | bool = _ssl_context(
+                    self.ca_cert_path, ca_digest
+                )
+            else:
+                # Use system CA certificate store
+                verify = True
+
+            self._http_client = httpx.AsyncClient(
+                timeout=_HTTP_TIMEOUT_SECONDS,
+                verify=verify,
+                headers={
+                    "Accept": "application/json",
+                    "User-Agent": "proms-mcp/1.0.0",
+                },
+            )
+        return self._http_client
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP client and any retired by a CA rotation."""
+        retiring = list(self._retiring.items())
+        for task, _ in retiring:
+            task.cancel()
+        await asyncio.gather(*(task for task, _ in retiring), return_exceptions=True)
+        for _, client in retiring:
+            await client.aclose()
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
+
     async def verify_token(self, token: str) -> AccessToken | None:
         """Verify token using OpenShift user info API."""
         # Validate token and get user identity
@@ -145,65 +291,112 @@ class OpenShiftUserVerifier(TokenVerifier):
             resource="proms-mcp-server",
         )
 
-    @cached(_auth_cache, key=lambda self, token: _cache_key(token))  # type: ignore[misc]
     async def _validate_token_identity(self, token: str) -> User | None:
-        """Validate token using OpenShift user info API.
+        """Validate token, using the auth cache and coalescing concurrent lookups.
 
-        Uses the /apis/user.openshift.io/v1/users/~ endpoint which is accessible
-        to all authenticated users without requiring special permissions.
+        Callers racing on the same uncached token await one shared lookup
+        instead of each issuing their own request to the API server.
+        """
+        key = _cache_key(token)
+        user = _auth_cache.get(key)
+        if user is not None:
+            return user
+        if key in _auth_negative_cache:
+            return None
+
+        task = self._pending.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_token_identity(key, token))
+            self._pending[key] = task
+            task.add_done_callback(lambda _: self._pending.pop(key, None))
+
+        # Shield so one cancelled caller doesn't cancel the lookup for the rest
+        return await asyncio.shield(task)
+
+    async def _fetch_token_identity(self, key: str, token: str) -> User | None:
+        """Look up the token's user and store the result in the auth cache.
+
+        Tokens rejected with 401/403 go to the short-lived negative cache. Any
+        other failure is not cached, so the token is retried as soon as the
+        API server recovers.
         """
-        # Configure HTTP client with proper CA certificate verification
-        if self.ca_cert_path:
-            # Use custom CA certificate with ssl.create_default_context()
-            ssl_context = ssl.create_default_context(cafile=self.ca_cert_path)
-            verify: ssl.SSLContext | bool = ssl_context
+        try:
+            user = await self._request_token_identity(token)
+        except httpx.HTTPStatusError as e:
+            # The API server answered, but not with a verdict on the token
+            logger.error(
+                "Authentication failed - unexpected OpenShift API response",
+                status_code=e.response.status_code,
+            )
+            return None
+        except httpx.HTTPError as e:
+            # These are system errors - we can't reach OpenShift API
+            logger.error(
+                "Authentication failed - cannot reach OpenShift API",
+                error=str(e),
+                error_type=type(e).__name__,
+            )
+            return None
+        except ValueError as e:
+            logger.error(
+                "Authentication failed - unparsable OpenShift API response",
+                error=str(e.__cause__ or e),
+            )
+            return None
+        except Exception as e:
+            # e.g. a malformed API URL; never let it escape into the auth backend
+            logger.error(
+                "Authentication failed - unexpected error",
+                error=str(e),
+                error_type=type(e).__name__,
+            )
+            return None
+
+        if user is None:
+            _auth_negative_cache[key] = None
         else:
-            # Use system CA certificate store
-            verify = True
-
-        userinfo_url = f"{self.api_url}/apis/user.openshift.io/v1/users/~"
-
-        async with httpx.AsyncClient(timeout=10.0, verify=verify) as client:
-            try:
-                response = await client.get(
-                    userinfo_url,
-                    headers={
-                        "Authorization": f"Bearer {token}",
-                        "Accept": "application/json",
-                        "User-Agent": "proms-mcp/1.0.0",
-                    },
-                )
+            _auth_cache[key] = user
+        return user
 
-                if response.status_code not in (200, 201):
-                    return None
+    async def _request_token_identity(self, token: str) -> User | None:
+        """Validate token using OpenShift user info API.
 
-                result = response.json()
+        Uses the /apis/user.openshift.io/v1/users/~ endpoint which is accessible
+        to all authenticated users without requiring special permissions.
+        """
+        client = self._get_http_client()
 
-                # Extract user information from OpenShift user object
-                username = result.get("metadata", {}).get("name", "")
-                uid = result.get("metadata", {}).get("uid", "")
+        response = await client.get(
+            self._userinfo_url, headers={"Authorization": f"Bearer {token}"}
+        )
 
-                return User(
-                    username=username,
-                    uid=uid,
-                    auth_method="openshift-userinfo",
-                )
+        # Only an explicit rejection says the token itself is bad
+        if response.status_code in (401, 403):
+            return None
 
-            except (
-                httpx.TimeoutException,
-                httpx.ConnectError,
-                httpx.NetworkError,
-            ) as e:
-                # These are system errors - we can't reach OpenShift API
-                logger.error(
-                    "Authentication failed - cannot reach OpenShift API",
-                    error=str(e),
-                    error_type=type(e).__name__,
-                )
-                return None
-            except Exception:
-                # Other errors (like JSON parsing) are also user/token issues
-                return None
+        # Throttling, redirects and server errors are not the token's fault
+        if response.status_code not in (200, 201):
+            raise httpx.HTTPStatusError(
+                f"Unexpected status {response.status_code} from OpenShift API",
+                request=response.request,
+                response=response,
+            )
+
+        try:
+            result = response.json()
+
+            # Extract user information from OpenShift user object
+            username = result.get("metadata", {}).get("name", "")
+            uid = result.get("metadata", {}).get("uid", "")
+        except Exception as e:
+            # A garbled 200 is a misrouted URL or proxy page, not a token verdict
+            raise ValueError("Unparsable user info response") from e
+
+        return User(
+            username=username,
+            uid=uid,
+            auth_method="openshift-userinfo",
+        )
 
 
 __all__ = [
@@ -129,9 +129,29 @@ def prometheus_error_handler(func: Callable[..., Any]) -> Callable[..., Any]:
 class PrometheusClient:
     """Prometheus API client wrapper with security and error handling."""
 
-    def __init__(self, datasource: PrometheusDataSource, timeout: int = 30):
+    def __init__(
+        self,
+        datasource: PrometheusDataSource,
+        timeout: int = 30,
+        http_client: httpx.AsyncClient | None = None,
+    ):
+        """Initialize the client for a datasource.
+
+        Args:
+            datasource: Datasource to query
+            timeout: Request timeout in seconds for the client built here
+            http_client: Optional client to use instead of building one. It is
+                used as-is, so it must already carry the datasource's auth
+                header and timeout, and it stays open when this client exits.
+        """
         self.datasource = datasource
         self.timeout = timeout
+        # Only a client built here is closed on exit; an injected one is the caller's
+        self._owns_http_client = http_client is None
+
+        if http_client is not None:
+            self.http_client = http_client
+            return
 
         # Setup headers
         headers = {}
@@ -147,7 +167,8 @@ class PrometheusClient:
         return self
 
     async def __aexit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
-        await self.http_client.aclose()
+        if self._owns_http_client:
+            await self.http_client.aclose()
 
     def _validate_promql(self, query: str) -> None:
         """Basic PromQL query validation."""
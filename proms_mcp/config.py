@@ -1,18 +1,30 @@
 """Configuration loader for Grafana datasource YAML files."""
 
 import os
+import sys
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Any
 
 import structlog
 import yaml
 
 from .auth import AuthMode
 
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _SafeLoader  # type: ignore[assignment]
+
 logger = structlog.get_logger()
 
 
-@dataclass
+def _intern(value: Any) -> Any:
+    """Intern string values so repeated names and headers share one object."""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+@dataclass(frozen=True, slots=True)
 class PrometheusDataSource:
     """Prometheus datasource configuration."""
 
@@ -31,17 +43,37 @@ class ConfigLoader:
     ):
         self.datasources_file = Path(datasources_file)
         self.datasources: dict[str, PrometheusDataSource] = {}
+        # (mtime_ns, size) of the file as last parsed, to skip unchanged reloads
+        self._loaded_stat: tuple[int, int] | None = None
 
     def load_datasources(self) -> dict[str, PrometheusDataSource]:
-        """Load all Prometheus datasources from the YAML file."""
-        if not self.datasources_file.exists():
+        """Load all Prometheus datasources from the YAML file.
+
+        The file is only re-parsed when its modification time or size changed
+        since the last successful load. This only helps repeated loads within
+        one process; the server itself loads once at startup.
+        """
+        try:
+            stat = self.datasources_file.stat()
+        except OSError as e:
+            # Missing file, or a path through a non-directory or symlink loop
             logger.warning(
-                "Datasources file does not exist", file=str(self.datasources_file)
+                "Datasources file does not exist",
+                file=str(self.datasources_file),
+                error=str(e),
             )
-            return {}
+            # A removed file means no datasources, like one with none listed
+            self.datasources = {}
+            self._loaded_stat = None
+            return self.datasources
+
+        file_stat = (stat.st_mtime_ns, stat.st_size)
+        if file_stat == self._loaded_stat:
+            return self.datasources
 
         try:
-            self._load_yaml_file(self.datasources_file)
+            self.datasources = self._load_yaml_file(self.datasources_file)
+            self._loaded_stat = file_stat
         except Exception as e:
             logger.error(
                 "Failed to load datasources file",
@@ -51,13 +83,14 @@ class ConfigLoader:
 
         return self.datasources
 
-    def _load_yaml_file(self, yaml_file: Path) -> None:
-        """Load datasources from the YAML file."""
+    def _load_yaml_file(self, yaml_file: Path) -> dict[str, PrometheusDataSource]:
+        """Parse datasources from the YAML file into a new dict."""
         with open(yaml_file) as f:
-            content = yaml.safe_load(f)
+            content = yaml.load(f, Loader=_SafeLoader)
 
+        datasources: dict[str, PrometheusDataSource] = {}
         if not content or "datasources" not in content:
-            return
+            return datasources
 
         for ds_config in content["datasources"]:
             # Skip non-prometheus datasources
@@ -66,7 +99,7 @@ class ConfigLoader:
 
             try:
                 datasource = self._parse_datasource(ds_config)
-                self.datasources[datasource.name] = datasource
+                datasources[datasource.name] = datasource
             except Exception as e:
                 logger.error(
                     "Failed to parse datasource",
@@ -75,6 +108,8 @@ class ConfigLoader:
                 )
                 continue
 
+        return datasources
+
     def _parse_datasource(self, ds_config: dict) -> PrometheusDataSource:
         """Parse a single datasource configuration."""
         # Extract authentication headers
@@ -84,10 +119,11 @@ class ConfigLoader:
         auth_header_name = json_data.get("httpHeaderName1")
         auth_header_value = secure_json_data.get("httpHeaderValue1")
 
+        # Header values are unique secrets, so only the repeated fields are interned
         return PrometheusDataSource(
-            name=ds_config["name"],
+            name=_intern(ds_config["name"]),
             url=ds_config["url"],
-            auth_header_name=auth_header_name,
+            auth_header_name=_intern(auth_header_name),
             auth_header_value=auth_header_value,
         )
 
@@ -100,8 +136,11 @@ class ConfigLoader:
         return list(self.datasources.keys())
 
     def reload(self) -> dict[str, PrometheusDataSource]:
-        """Reload datasources from files."""
-        self.datasources.clear()
+        """Reload datasources from files.
+
+        The previous datasources stay in place if the file cannot be parsed.
+        """
+        self._loaded_stat = None
         return self.load_datasources()
 
 
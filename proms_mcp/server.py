@@ -14,8 +14,10 @@ from typing import Any
 
 import structlog
 from fastmcp import FastMCP
+from starlette.middleware import Middleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-from .auth import AuthMode
+from .auth import AuthMode, OpenShiftUserVerifier
 from .client import get_prometheus_client
 from .config import ConfigLoader, get_auth_mode, get_config_loader
 from .logging import configure_logging
@@ -239,8 +241,6 @@ def initialize_server() -> None:
         ca_cert_path = os.getenv("OPENSHIFT_CA_CERT_PATH")
 
         # Create OpenShift user info based verifier
-        from .auth import OpenShiftUserVerifier
-
         auth_provider = OpenShiftUserVerifier(
             api_url=openshift_api_url,
             required_scopes=["read:data"],
@@ -683,6 +683,30 @@ if "pytest" not in sys.modules and not os.getenv("PYTEST_CURRENT_TEST"):
     initialize_server()
 
 
+class AuthShutdownMiddleware:
+    """ASGI middleware that closes the auth provider's HTTP client on shutdown.
+
+    FastMCP's own lifespan is entered per request under stateless HTTP, so the
+    application lifespan is the hook that runs once when the server stops.
+    """
+
+    def __init__(self, app: ASGIApp, verifier: OpenShiftUserVerifier) -> None:
+        self.app = app
+        self.verifier = verifier
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "lifespan":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "lifespan.shutdown.complete":
+                await self.verifier.aclose()
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
 def main() -> None:
     """Main entry point for the server."""
     if not app:
@@ -699,6 +723,11 @@ def main() -> None:
 
     logger.info(f"Starting MCP server on {host}:{port}{path}")
 
+    # Release the verifier's pooled connections when the server stops
+    run_kwargs: dict[str, Any] = {}
+    if isinstance(app.auth, OpenShiftUserVerifier):
+        run_kwargs["middleware"] = [Middleware(AuthShutdownMiddleware, app.auth)]
+
     # Use FastMCP's built-in server runner
     try:
         app.run(
@@ -708,6 +737,7 @@ def main() -> None:
             path=path,
             log_level=log_level,
             stateless_http=True,
+            **run_kwargs,
         )
     except KeyboardInterrupt:
         logger.info("Shutting down gracefully...")
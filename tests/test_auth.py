@@ -1,17 +1,76 @@
 """Tests for authentication functionality."""
 
-import json
+import asyncio
 import os
 import time
-from unittest.mock import AsyncMock, Mock, patch
+from collections.abc import AsyncIterator, Callable, Iterator
+from functools import partial
+from pathlib import Path
+from typing import Any
+from unittest.mock import Mock, patch
 
 import httpx
 import pytest
 from fastmcp.server.auth.auth import AccessToken
 
-from proms_mcp.auth import AuthMode, OpenShiftUserVerifier, User, clear_auth_cache
+import proms_mcp.auth
+from proms_mcp.auth import (
+    AuthMode,
+    OpenShiftUserVerifier,
+    User,
+    _detect_in_cluster_ca,
+    clear_auth_cache,
+)
 from proms_mcp.config import get_auth_mode
 
+API_URL = "https://api.cluster.example.com:6443"
+USERINFO_URL = f"{API_URL}/apis/user.openshift.io/v1/users/~"
+
+
+def assert_client_verify(mock_client_class: Mock, expected: object) -> None:
+    """Assert the HTTP client was built once with the given TLS verify setting."""
+    mock_client_class.assert_called_once_with(
+        timeout=10.0,
+        verify=expected,
+        headers={"Accept": "application/json", "User-Agent": "proms-mcp/1.0.0"},
+    )
+
+
+def patch_userinfo_api(
+    status_code: int = 200,
+    payload: Any = None,
+    content: bytes | None = None,
+    error: Exception | None = None,
+) -> tuple[Any, list[httpx.Request]]:
+    """Route the verifier's HTTP client through an in-memory httpx transport.
+
+    Returns the patcher and the list of requests the transport received.
+    Entering the patcher yields a mock wrapping the client factory, so tests
+    can still assert on the arguments the client was built with.
+    """
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if error is not None:
+            raise error
+        return httpx.Response(status_code, content=content, json=payload)
+
+    transport = httpx.MockTransport(handler)
+    patcher = patch(
+        "proms_mcp.auth.httpx.AsyncClient",
+        Mock(wraps=partial(httpx.AsyncClient, transport=transport)),
+    )
+    return patcher, requests
+
+
+def assert_user(user: User | None, username: str, uid: str) -> None:
+    """Assert a user resolved from the OpenShift user info API."""
+    assert user is not None
+    assert user.username == username
+    assert user.uid == uid
+    assert user.auth_method == "openshift-userinfo"
+
 
 # User model tests
 def test_user_creation() -> None:
@@ -40,43 +99,26 @@ def test_user_equality() -> None:
 
 
 # Auth config tests
-def test_get_auth_mode_default() -> None:
-    """Test get_auth_mode returns ACTIVE by default."""
-    with patch.dict(os.environ, {}, clear=True):
-        auth_mode = get_auth_mode()
-        assert auth_mode == AuthMode.ACTIVE
-
-
-def test_get_auth_mode_none() -> None:
-    """Test get_auth_mode with AUTH_MODE=none."""
-    with patch.dict(os.environ, {"AUTH_MODE": "none"}):
-        auth_mode = get_auth_mode()
-        assert auth_mode == AuthMode.NONE
-
-
-def test_get_auth_mode_active() -> None:
-    """Test get_auth_mode with AUTH_MODE=active."""
-    with patch.dict(os.environ, {"AUTH_MODE": "active"}):
-        auth_mode = get_auth_mode()
-        assert auth_mode == AuthMode.ACTIVE
-
-
-def test_get_auth_mode_case_insensitive() -> None:
-    """Test get_auth_mode is case insensitive."""
-    with patch.dict(os.environ, {"AUTH_MODE": "NONE"}):
-        auth_mode = get_auth_mode()
-        assert auth_mode == AuthMode.NONE
-
-    with patch.dict(os.environ, {"AUTH_MODE": "Active"}):
-        auth_mode = get_auth_mode()
-        assert auth_mode == AuthMode.ACTIVE
-
-
-def test_get_auth_mode_invalid_defaults_to_active() -> None:
-    """Test get_auth_mode defaults to ACTIVE for invalid values."""
-    with patch.dict(os.environ, {"AUTH_MODE": "invalid"}):
-        auth_mode = get_auth_mode()
-        assert auth_mode == AuthMode.ACTIVE
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        pytest.param(None, AuthMode.ACTIVE, id="default"),
+        pytest.param("none", AuthMode.NONE, id="none"),
+        pytest.param("active", AuthMode.ACTIVE, id="active"),
+        pytest.param("NONE", AuthMode.NONE, id="case-insensitive-none"),
+        pytest.param("Active", AuthMode.ACTIVE, id="case-insensitive-active"),
+        pytest.param("invalid", AuthMode.ACTIVE, id="invalid-defaults-to-active"),
+    ],
+)
+def test_get_auth_mode(
+    monkeypatch: pytest.MonkeyPatch, value: str | None, expected: AuthMode
+) -> None:
+    """Test get_auth_mode parses AUTH_MODE, defaulting to ACTIVE."""
+    if value is None:
+        monkeypatch.delenv("AUTH_MODE", raising=False)
+    else:
+        monkeypatch.setenv("AUTH_MODE", value)
+    assert get_auth_mode() == expected
 
 
 # TokenReview tests (consolidated from the original test_tokenreview_auth.py)
@@ -88,16 +130,24 @@ class TestOpenShiftUserVerifier:
         """Clear auth cache before each test."""
         clear_auth_cache()
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def verifier(self) -> OpenShiftUserVerifier:
-        """Create a OpenShiftUserVerifier instance for testing."""
+        """Create a OpenShiftUserVerifier instance shared by the class's tests."""
         return OpenShiftUserVerifier(
-            api_url="https://api.cluster.example.com:6443",
+            api_url=API_URL,
             required_scopes=["read:data"],
             ca_cert_path=None,
         )
 
-    @pytest.fixture
+    @pytest.fixture(autouse=True)
+    async def reset_http_client(
+        self, verifier: OpenShiftUserVerifier
+    ) -> AsyncIterator[None]:
+        """Close the shared verifier's HTTP client so each test patches its own."""
+        yield
+        await verifier.aclose()
+
+    @pytest.fixture(scope="class")
     def mock_successful_userinfo_response(self) -> dict:
         """Mock successful OpenShift user info API response."""
         return {
@@ -111,204 +161,113 @@ class TestOpenShiftUserVerifier:
             "identities": [],
         }
 
-    @pytest.fixture
-    def mock_failed_userinfo_response(self) -> dict:
-        """Mock failed OpenShift user info API response (401 error)."""
-        return {
-            "kind": "Status",
-            "apiVersion": "v1",
-            "status": "Failure",
-            "message": "Unauthorized",
-            "code": 401,
-        }
-
     def test_init(self) -> None:
         """Test OpenShiftUserVerifier initialization."""
         verifier = OpenShiftUserVerifier(
-            api_url="https://api.cluster.example.com:6443/",
+            api_url=f"{API_URL}/",
             required_scopes=["read:data"],
         )
 
-        assert verifier.api_url == "https://api.cluster.example.com:6443"
+        assert verifier.api_url == API_URL
         assert verifier.required_scopes == ["read:data"]
 
     def test_init_defaults(self) -> None:
         """Test OpenShiftUserVerifier initialization with defaults."""
-        verifier = OpenShiftUserVerifier(api_url="https://api.cluster.example.com:6443")
+        verifier = OpenShiftUserVerifier(api_url=API_URL)
 
         assert verifier.required_scopes == ["read:data"]
 
-    @pytest.mark.asyncio
     async def test_verify_token_success(
         self, verifier: OpenShiftUserVerifier, mock_successful_userinfo_response: dict
     ) -> None:
         """Test successful token verification."""
         token = "valid-bearer-token"
 
-        with patch("proms_mcp.auth.httpx.AsyncClient") as mock_client_class:
-            mock_client = AsyncMock()
-            mock_client_class.return_value.__aenter__.return_value = mock_client
-
-            mock_response = Mock()
-            mock_response.status_code = 200
-            mock_response.content = b'{"status": "success"}'  # Mock content for logging
-            mock_response.headers = {"content-type": "application/json"}
-            mock_response.text = '{"status": "success"}'
-            mock_response.json.return_value = mock_successful_userinfo_response
-            mock_client.get.return_value = mock_response
-
-            access_token = await verifier.verify_token(token)
-
-            assert access_token is not None
-            assert isinstance(access_token, AccessToken)
-            assert access_token.token == token
-            assert access_token.client_id == "testuser"
-            assert access_token.scopes == [
-                "read:data"
-            ]  # Only read access for proms-mcp
-            assert access_token.resource == "proms-mcp-server"
-            assert access_token.expires_at is not None
-            assert access_token.expires_at > int(time.time())
-
-            # Verify the API call
-            mock_client.get.assert_called_once_with(
-                "https://api.cluster.example.com:6443/apis/user.openshift.io/v1/users/~",
-                headers={
-                    "Authorization": f"Bearer {token}",
-                    "Accept": "application/json",
-                    "User-Agent": "proms-mcp/1.0.0",
-                },
-            )
-
-    @pytest.mark.asyncio
-    async def test_verify_token_authentication_failed(
-        self, verifier: OpenShiftUserVerifier, mock_failed_userinfo_response: dict
-    ) -> None:
-        """Test token verification when authentication fails."""
-        token = "invalid-bearer-token"
-
-        with patch("proms_mcp.auth.httpx.AsyncClient") as mock_client_class:
-            mock_client = AsyncMock()
-            mock_client_class.return_value.__aenter__.return_value = mock_client
-
-            mock_response = Mock()
-            mock_response.status_code = 401
-            mock_response.content = b'{"status": "Failure"}'
-            mock_response.headers = {"content-type": "application/json"}
-            mock_response.text = '{"status": "Failure"}'
-            mock_response.json.return_value = mock_failed_userinfo_response
-            mock_client.get.return_value = mock_response
-
+        patcher, _ = patch_userinfo_api(payload=mock_successful_userinfo_response)
+        with patcher:
             access_token = await verifier.verify_token(token)
 
-            assert access_token is None
+        assert access_token is not None
+        assert isinstance(access_token, AccessToken)
+        assert access_token.token == token
+        assert access_token.client_id == "testuser"
+        assert access_token.scopes == ["read:data"]  # Only read access for proms-mcp
+        assert access_token.resource == "proms-mcp-server"
+        assert access_token.expires_at is not None
+        assert access_token.expires_at > int(time.time())
 
-    @pytest.mark.asyncio
-    async def test_verify_token_api_error(
-        self, verifier: OpenShiftUserVerifier
-    ) -> None:
-        """Test token verification when API returns error."""
-        token = "some-token"
-
-        with patch("proms_mcp.auth.httpx.AsyncClient") as mock_client_class:
-            mock_client = AsyncMock()
-            mock_client_class.return_value.__aenter__.return_value = mock_client
-
-            mock_response = Mock()
-            mock_response.status_code = 401
-            mock_response.text = "Unauthorized"
-            mock_response.content = b"Unauthorized"
-            mock_response.headers = {"content-type": "text/plain"}
-            mock_client.get.return_value = mock_response
-
-            access_token = await verifier.verify_token(token)
-
-            assert access_token is None
-
-    @pytest.mark.asyncio
-    async def test_verify_token_timeout(self, verifier: OpenShiftUserVerifier) -> None:
-        """Test token verification with timeout."""
-        token = "some-token"
-
-        with patch("proms_mcp.auth.httpx.AsyncClient") as mock_client_class:
-            mock_client = AsyncMock()
-            mock_client_class.return_value.__aenter__.return_value = mock_client
-
-            mock_client.get.side_effect = httpx.TimeoutException("Request timed out")
-
-            access_token = await verifier.verify_token(token)
-
-            assert access_token is None
-
-    @pytest.mark.asyncio
-    async def test_verify_token_http_error(
-        self, verifier: OpenShiftUserVerifier
+    async def test_verify_token_calls_userinfo_api(
+        self, verifier: OpenShiftUserVerifier, mock_successful_userinfo_response: dict
     ) -> None:
-        """Test token verification with HTTP error."""
-        token = "some-token"
-
-        with patch("proms_mcp.auth.httpx.AsyncClient") as mock_client_class:
-            mock_client = AsyncMock()
-            mock_client_class.return_value.__aenter__.return_value = mock_client
-
-            mock_client.get.side_effect = httpx.HTTPError("Network error")
-
-            access_token = await verifier.verify_token(token)
-
-            assert access_token is None
+        """Test that verification sends the token to the user info endpoint."""
+        token = "valid-bearer-token"
 
-    @pytest.mark.asyncio
-    async def test_verify_token_json_decode_error(
-        self, verifier: OpenShiftUserVerifier
+        patcher, requests = patch_userinfo_api(
+            payload=mock_successful_userinfo_response
+        )
+        with patcher:
+            await verifier.verify_token(token)
+
+        assert len(requests) == 1
+        request = requests[0]
+        assert request.method == "GET"
+        assert str(request.url) == USERINFO_URL
+        assert request.headers["Authorization"] == f"Bearer {token}"
+        assert request.headers["Accept"] == "application/json"
+        assert request.headers["User-Agent"] == "proms-mcp/1.0.0"
+
+    @pytest.mark.parametrize(
+        "response_kwargs",
+        [
+            pytest.param(
+                {
+                    "status_code": 401,
+                    "payload": {
+                        "kind": "Status",
+                        "apiVersion": "v1",
+                        "status": "Failure",
+                        "message": "Unauthorized",
+                        "code": 401,
+                    },
+                },
+                id="authentication-failed",
+            ),
+            pytest.param(
+                {"status_code": 401, "content": b"Unauthorized"}, id="api-error"
+            ),
+            pytest.param(
+                {"error": httpx.TimeoutException("Request timed out")}, id="timeout"
+            ),
+            pytest.param({"error": httpx.HTTPError("Network error")}, id="http-error"),
+            pytest.param({"content": b"invalid json"}, id="bad-json"),
+            pytest.param(
+                {"error": RuntimeError("Cannot send a request")}, id="unexpected"
+            ),
+        ],
+    )
+    async def test_verify_token_failure_paths(
+        self, verifier: OpenShiftUserVerifier, response_kwargs: dict[str, Any]
     ) -> None:
-        """Test token verification with invalid JSON response."""
-        token = "some-token"
-
-        with patch("proms_mcp.auth.httpx.AsyncClient") as mock_client_class:
-            mock_client = AsyncMock()
-            mock_client_class.return_value.__aenter__.return_value = mock_client
-
-            mock_response = Mock()
-            mock_response.status_code = 200
-            mock_response.content = b"invalid json"
-            mock_response.headers = {"content-type": "application/json"}
-            mock_response.text = "invalid json"
-            mock_response.json.side_effect = json.JSONDecodeError("Invalid JSON", "", 0)
-            mock_client.get.return_value = mock_response
+        """Test token verification when the user info lookup fails."""
+        patcher, _ = patch_userinfo_api(**response_kwargs)
+        with patcher:
+            access_token = await verifier.verify_token("some-token")
 
-            access_token = await verifier.verify_token(token)
-
-            assert access_token is None
+        assert access_token is None
 
-    @pytest.mark.asyncio
     async def test_validate_token_identity_success(
         self, verifier: OpenShiftUserVerifier, mock_successful_userinfo_response: dict
     ) -> None:
         """Test successful token identity validation."""
         token = "valid-token"
 
-        with patch("proms_mcp.auth.httpx.AsyncClient") as mock_client_class:
-            mock_client = AsyncMock()
-            mock_client_class.return_value.__aenter__.return_value = mock_client
-
-            mock_response = Mock()
-            mock_response.status_code = 200
-            mock_response.content = b'{"kind": "User"}'  # Mock content for logging
-            mock_response.headers = {"content-type": "application/json"}
-            mock_response.text = '{"kind": "User"}'
-            mock_response.json.return_value = mock_successful_userinfo_response
-            mock_client.get.return_value = mock_response
-
+        patcher, _ = patch_userinfo_api(payload=mock_successful_userinfo_response)
+        with patcher:
             user = await verifier._validate_token_identity(token)
 
-            assert user is not None
-            assert isinstance(user, User)
-            assert user.username == "testuser"
-            assert user.uid == "12345-67890-abcdef"
-
-            assert user.auth_method == "openshift-userinfo"
+        assert isinstance(user, User)
+        assert_user(user, "testuser", "12345-67890-abcdef")
 
-    @pytest.mark.asyncio
     async def test_validate_token_identity_missing_user_info(
         self, verifier: OpenShiftUserVerifier
     ) -> None:
@@ -322,27 +281,12 @@ class TestOpenShiftUserVerifier:
             "identities": [],
         }
 
-        with patch("proms_mcp.auth.httpx.AsyncClient") as mock_client_class:
-            mock_client = AsyncMock()
-            mock_client_class.return_value.__aenter__.return_value = mock_client
-
-            mock_response = Mock()
-            mock_response.status_code = 200
-            mock_response.content = b'{"kind": "User"}'
-            mock_response.headers = {"content-type": "application/json"}
-            mock_response.text = '{"kind": "User"}'
-            mock_response.json.return_value = response_without_metadata
-            mock_client.get.return_value = mock_response
-
+        patcher, _ = patch_userinfo_api(payload=response_without_metadata)
+        with patcher:
             user = await verifier._validate_token_identity(token)
 
-            assert user is not None
-            assert user.username == ""
-            assert user.uid == ""
-
-            assert user.auth_method == "openshift-userinfo"
+        assert_user(user, "", "")
 
-    @pytest.mark.asyncio
     async def test_validate_token_identity_partial_user_info(
         self, verifier: OpenShiftUserVerifier
     ) -> None:
@@ -359,145 +303,246 @@ class TestOpenShiftUserVerifier:
             "identities": [],
         }
 
-        with patch("proms_mcp.auth.httpx.AsyncClient") as mock_client_class:
-            mock_client = AsyncMock()
-            mock_client_class.return_value.__aenter__.return_value = mock_client
-
-            mock_response = Mock()
-            mock_response.status_code = 200
-            mock_response.content = (
-                b'{"kind": "User", "metadata": {"name": "testuser"}}'
-            )
-            mock_response.headers = {"content-type": "application/json"}
-            mock_response.text = '{"kind": "User", "metadata": {"name": "testuser"}}'
-            mock_response.json.return_value = response_partial_user
-            mock_client.get.return_value = mock_response
-
+        patcher, _ = patch_userinfo_api(payload=response_partial_user)
+        with patcher:
             user = await verifier._validate_token_identity(token)
 
-            assert user is not None
-            assert user.username == "testuser"
-            assert user.uid == ""
+        assert_user(user, "testuser", "")
 
-            assert user.auth_method == "openshift-userinfo"
-
-    @pytest.mark.asyncio
     async def test_client_timeout_configuration(
         self, verifier: OpenShiftUserVerifier
     ) -> None:
         """Test that HTTP client is configured with correct timeout."""
         token = "some-token"
 
-        with patch("proms_mcp.auth.httpx.AsyncClient") as mock_client_class:
-            mock_client = AsyncMock()
-            mock_client_class.return_value.__aenter__.return_value = mock_client
+        patcher, _ = patch_userinfo_api(payload={"kind": "Status", "status": "Failure"})
+        with patcher as mock_client_class:
+            await verifier._validate_token_identity(token)
 
-            mock_response = Mock()
-            mock_response.status_code = 200
-            mock_response.content = b'{"kind": "Status", "status": "Failure"}'
-            mock_response.headers = {"content-type": "application/json"}
-            mock_response.text = '{"kind": "Status", "status": "Failure"}'
-            mock_response.json.return_value = {"kind": "Status", "status": "Failure"}
-            mock_client.get.return_value = mock_response
+        # Verify client was created with correct timeout and verify settings
+        assert_client_verify(mock_client_class, True)
 
-            await verifier._validate_token_identity(token)
+    async def test_http_client_reused_across_validations(
+        self, verifier: OpenShiftUserVerifier, mock_successful_userinfo_response: dict
+    ) -> None:
+        """Test that one HTTP client serves every validation until closed."""
+        patcher, requests = patch_userinfo_api(
+            payload=mock_successful_userinfo_response
+        )
+        with patcher:
+            await verifier._validate_token_identity("first-token")
+            client = verifier._http_client
+            await verifier._validate_token_identity("second-token")
+
+        assert len(requests) == 2
+        assert client is not None
+        assert verifier._http_client is client
+
+        await verifier.aclose()
 
-            # Verify client was created with correct timeout and verify settings
-            mock_client_class.assert_called_once_with(timeout=10.0, verify=True)
+        assert client.is_closed
+        assert verifier._http_client is None
 
-    def test_api_url_normalization(self) -> None:
+    @pytest.mark.parametrize("api_url", [f"{API_URL}/", API_URL])
+    def test_api_url_normalization(self, api_url: str) -> None:
         """Test that API URL is normalized correctly."""
-        verifier_with_trailing_slash = OpenShiftUserVerifier(
-            api_url="https://api.cluster.example.com:6443/"
+        verifier = OpenShiftUserVerifier(api_url=api_url)
+
+        assert verifier.api_url == API_URL
+        assert verifier._userinfo_url == USERINFO_URL
+
+    def test_ca_cert_path_explicit(self, tmp_path: Path) -> None:
+        """Test explicit CA certificate path."""
+        ca_cert = tmp_path / "ca.crt"
+        ca_cert.write_text(
+            "-----BEGIN CERTIFICATE-----\ntest\n-----END CERTIFICATE-----"
         )
-        verifier_without_trailing_slash = OpenShiftUserVerifier(
-            api_url="https://api.cluster.example.com:6443"
+
+        verifier = OpenShiftUserVerifier(
+            api_url=API_URL,
+            ca_cert_path=str(ca_cert),
         )
+        assert verifier.ca_cert_path == str(ca_cert)
 
-        assert (
-            verifier_with_trailing_slash.api_url
-            == "https://api.cluster.example.com:6443"
+    def test_ssl_context_shared_per_ca_path(self, tmp_path: Path) -> None:
+        """Test that verifiers with the same CA path reuse one SSL context."""
+        ca_cert = tmp_path / "ca.crt"
+        ca_cert.write_text(
+            "-----BEGIN CERTIFICATE-----\ntest\n-----END CERTIFICATE-----"
         )
-        assert (
-            verifier_without_trailing_slash.api_url
-            == "https://api.cluster.example.com:6443"
+        verifiers = [
+            OpenShiftUserVerifier(
+                api_url=API_URL,
+                ca_cert_path=str(ca_cert),
+            )
+            for _ in range(2)
+        ]
+
+        patcher, _ = patch_userinfo_api()
+        with (
+            patcher as mock_client_class,
+            patch("proms_mcp.auth.ssl.create_default_context") as mock_context,
+        ):
+            for verifier in verifiers:
+                verifier._get_http_client()
+
+        mock_context.assert_called_once_with(cafile=str(ca_cert))
+        first, second = mock_client_class.call_args_list
+        assert first.kwargs["verify"] is mock_context.return_value
+        assert second.kwargs["verify"] is mock_context.return_value
+
+    @staticmethod
+    def touch(path: Path) -> None:
+        """Move a file's mtime forward, as a rewrite of the file would."""
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    async def test_http_client_rebuilt_on_ca_rotation(self, tmp_path: Path) -> None:
+        """Test that new CA content yields a new SSL context and client."""
+        ca_cert = tmp_path / "ca.crt"
+        ca_cert.write_text(
+            "-----BEGIN CERTIFICATE-----\ntest\n-----END CERTIFICATE-----"
         )
-
-    def test_ca_cert_path_explicit(self) -> None:
-        """Test explicit CA certificate path."""
-        with patch("proms_mcp.auth.Path.exists", return_value=True):
-            verifier = OpenShiftUserVerifier(
-                api_url="https://api.cluster.example.com:6443",
-                ca_cert_path="/custom/ca.crt",
+        verifier = OpenShiftUserVerifier(api_url=API_URL, ca_cert_path=str(ca_cert))
+
+        patcher, _ = patch_userinfo_api()
+        with (
+            patcher,
+            patch("proms_mcp.auth.ssl.create_default_context") as mock_context,
+            patch("proms_mcp.auth._HTTP_TIMEOUT_SECONDS", 0),
+        ):
+            client = verifier._get_http_client()
+            assert verifier._get_http_client() is client
+
+            ca_cert.write_text(
+                "-----BEGIN CERTIFICATE-----\nrotated\n-----END CERTIFICATE-----"
             )
-            assert verifier.ca_cert_path == "/custom/ca.crt"
+            self.touch(ca_cert)
+            rotated = verifier._get_http_client()
+
+            # The old client is closed once its grace period is over
+            await asyncio.gather(*verifier._retiring)
 
-    def test_ca_cert_path_explicit_not_exists(self) -> None:
+        assert rotated is not client
+        assert mock_context.call_count == 2
+        assert client.is_closed
+        assert not rotated.is_closed
+
+        await verifier.aclose()
+        assert rotated.is_closed
+
+    async def test_http_client_kept_when_ca_content_unchanged(
+        self, tmp_path: Path
+    ) -> None:
+        """Test that rewriting the CA file with the same content keeps the client."""
+        ca_cert = tmp_path / "ca.crt"
+        ca_cert.write_text(
+            "-----BEGIN CERTIFICATE-----\ntest\n-----END CERTIFICATE-----"
+        )
+        verifier = OpenShiftUserVerifier(api_url=API_URL, ca_cert_path=str(ca_cert))
+
+        patcher, _ = patch_userinfo_api()
+        with (
+            patcher,
+            patch("proms_mcp.auth.ssl.create_default_context") as mock_context,
+        ):
+            client = verifier._get_http_client()
+            # e.g. a projected volume refreshing the service account token
+            self.touch(ca_cert)
+            assert verifier._get_http_client() is client
+
+        mock_context.assert_called_once()
+        assert verifier._retiring == {}
+        await verifier.aclose()
+
+    async def test_aclose_closes_retiring_clients(self, tmp_path: Path) -> None:
+        """Test that shutdown closes a retired client without waiting out its grace."""
+        ca_cert = tmp_path / "ca.crt"
+        ca_cert.write_text("first")
+        verifier = OpenShiftUserVerifier(api_url=API_URL, ca_cert_path=str(ca_cert))
+
+        patcher, _ = patch_userinfo_api()
+        with patcher, patch("proms_mcp.auth.ssl.create_default_context"):
+            client = verifier._get_http_client()
+            ca_cert.write_text("second")
+            self.touch(ca_cert)
+            verifier._get_http_client()
+
+        await verifier.aclose()
+        assert client.is_closed
+        assert verifier._retiring == {}
+
+    def test_ca_cert_path_explicit_not_exists(self, tmp_path: Path) -> None:
         """Test explicit CA certificate path that doesn't exist - should raise ValueError."""
-        with patch("proms_mcp.auth.Path.exists", return_value=False):
-            with pytest.raises(
-                ValueError, match="CA certificate file not found: /nonexistent/ca.crt"
-            ):
-                OpenShiftUserVerifier(
-                    api_url="https://api.cluster.example.com:6443",
-                    ca_cert_path="/nonexistent/ca.crt",
-                )
-
-    @pytest.mark.asyncio
-    async def test_tls_verification_always_enabled(self) -> None:
+        missing = tmp_path / "ca.crt"
+
+        with pytest.raises(
+            ValueError, match=f"CA certificate file not found: {missing}"
+        ):
+            OpenShiftUserVerifier(
+                api_url=API_URL,
+                ca_cert_path=str(missing),
+            )
+
+    async def test_tls_verification_always_enabled(
+        self, verifier: OpenShiftUserVerifier
+    ) -> None:
         """Test that TLS verification is always enabled - never disabled."""
-        verifier = OpenShiftUserVerifier(
-            api_url="https://api.cluster.example.com:6443",
-            ca_cert_path=None,  # No explicit CA cert
-        )
         token = "test-token"
 
-        with patch("proms_mcp.auth.httpx.AsyncClient") as mock_client_class:
-            mock_client = AsyncMock()
-            mock_client_class.return_value.__aenter__.return_value = mock_client
-
-            mock_response = Mock()
-            mock_response.status_code = 200
-            mock_response.content = b'{"kind": "User"}'
-            mock_response.headers = {"content-type": "application/json"}
-            mock_response.text = '{"kind": "User"}'
-            mock_response.json.return_value = {"kind": "User", "metadata": {}}
-            mock_client.get.return_value = mock_response
-
+        patcher, _ = patch_userinfo_api(payload={"kind": "User", "metadata": {}})
+        with patcher as mock_client_class:
             await verifier._validate_token_identity(token)
 
-            # Verify TLS verification is enabled (verify=True for system CA store)
-            mock_client_class.assert_called_once_with(timeout=10.0, verify=True)
+        # Verify TLS verification is enabled (verify=True for system CA store)
+        assert_client_verify(mock_client_class, True)
 
-    def test_ca_cert_path_auto_detect_in_cluster(self) -> None:
-        """Test auto-detection of in-cluster CA certificate."""
+    @pytest.fixture
+    def fresh_in_cluster_ca(self) -> Iterator[None]:
+        """Re-probe the in-cluster CA, and forget patched results afterwards."""
+        _detect_in_cluster_ca.cache_clear()
+        yield
+        _detect_in_cluster_ca.cache_clear()
+
+    @pytest.mark.usefixtures("fresh_in_cluster_ca")
+    @pytest.mark.parametrize(
+        ("existing_paths", "expected"),
+        [
+            pytest.param(
+                {"/var/run/secrets/kubernetes.io/serviceaccount/ca.crt"},
+                "/var/run/secrets/kubernetes.io/serviceaccount/ca.crt",
+                id="in-cluster",
+            ),
+            pytest.param(set(), None, id="no-cert-available"),
+        ],
+    )
+    def test_ca_cert_path_auto_detect(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+        existing_paths: set[str],
+        expected: str | None,
+    ) -> None:
+        """Test CA certificate auto-detection when no explicit path is given."""
+        monkeypatch.setattr(
+            "proms_mcp.auth.Path.exists", lambda path: str(path) in existing_paths
+        )
 
-        def mock_exists(self: object) -> bool:
-            return str(self) == "/var/run/secrets/kubernetes.io/serviceaccount/ca.crt"
+        verifier = OpenShiftUserVerifier(api_url=API_URL, ca_cert_path=None)
+        assert verifier.ca_cert_path == expected
 
-        with patch("proms_mcp.auth.Path.exists", mock_exists):
-            verifier = OpenShiftUserVerifier(
-                api_url="https://api.cluster.example.com:6443", ca_cert_path=None
-            )
-            assert (
-                verifier.ca_cert_path
-                == "/var/run/secrets/kubernetes.io/serviceaccount/ca.crt"
-            )
+    @pytest.mark.usefixtures("fresh_in_cluster_ca")
+    def test_in_cluster_ca_probed_once(self) -> None:
+        """Test that in-cluster CA detection is not repeated per verifier."""
+        with patch("proms_mcp.auth.Path.exists", return_value=False) as mock_exists:
+            for _ in range(3):
+                OpenShiftUserVerifier(api_url=API_URL, ca_cert_path=None)
 
-    def test_ca_cert_path_no_cert_available(self) -> None:
-        """Test when no CA certificate is available."""
-        with patch("proms_mcp.auth.Path.exists", return_value=False):
-            verifier = OpenShiftUserVerifier(
-                api_url="https://api.cluster.example.com:6443", ca_cert_path=None
-            )
-            assert verifier.ca_cert_path is None
+        mock_exists.assert_called_once()
 
-    @pytest.mark.asyncio
-    async def test_service_account_authentication(self) -> None:
+    async def test_service_account_authentication(
+        self, verifier: OpenShiftUserVerifier
+    ) -> None:
         """Test that service accounts can authenticate successfully."""
-        verifier = OpenShiftUserVerifier(
-            api_url="https://api.cluster.example.com:6443", ca_cert_path=None
-        )
         token = "test-token"
 
         service_account_response = {
@@ -511,70 +556,43 @@ class TestOpenShiftUserVerifier:
             "identities": [],
         }
 
-        with patch("proms_mcp.auth.httpx.AsyncClient") as mock_client_class:
-            mock_client = AsyncMock()
-            mock_client_class.return_value.__aenter__.return_value = mock_client
-
-            mock_response = Mock()
-            mock_response.status_code = 200
-            mock_response.content = b'{"kind": "User"}'
-            mock_response.headers = {"content-type": "application/json"}
-            mock_response.text = '{"kind": "User"}'
-            mock_response.json.return_value = service_account_response
-            mock_client.get.return_value = mock_response
-
+        patcher, _ = patch_userinfo_api(payload=service_account_response)
+        with patcher:
             user = await verifier._validate_token_identity(token)
 
-            assert user is not None
-            assert user.username == "system:serviceaccount:test-namespace:test-sa"
-            assert user.uid == "12345-67890-abcdef"
-            assert user.auth_method == "openshift-userinfo"
+        assert_user(
+            user, "system:serviceaccount:test-namespace:test-sa", "12345-67890-abcdef"
+        )
 
-    @pytest.mark.asyncio
-    async def test_network_error_logging(self) -> None:
+    async def test_network_error_logging(self, verifier: OpenShiftUserVerifier) -> None:
         """Test that network errors are logged as ERROR while token errors are WARNING."""
-        verifier = OpenShiftUserVerifier(
-            api_url="https://api.cluster.example.com:6443", ca_cert_path=None
-        )
         token = "test-token"
 
         # Test network error (should log as ERROR)
-        with patch("proms_mcp.auth.httpx.AsyncClient") as mock_client_class:
-            mock_client = AsyncMock()
-            mock_client_class.return_value.__aenter__.return_value = mock_client
-            mock_client.get.side_effect = httpx.ConnectError("Connection failed")
-
-            with patch("proms_mcp.auth.logger") as mock_logger:
-                user = await verifier._validate_token_identity(token)
+        patcher, _ = patch_userinfo_api(error=httpx.ConnectError("Connection failed"))
+        with patcher, patch("proms_mcp.auth.logger") as mock_logger:
+            user = await verifier._validate_token_identity(token)
 
-                assert user is None
-                # Verify ERROR log for network issues
-                mock_logger.error.assert_called_once()
-                call_args = mock_logger.error.call_args[0]  # Get positional arguments
-                assert "cannot reach OpenShift API" in call_args[0]
+            assert user is None
+            # Verify ERROR log for network issues
+            mock_logger.error.assert_called_once()
+            call_args = mock_logger.error.call_args[0]  # Get positional arguments
+            assert "cannot reach OpenShift API" in call_args[0]
 
         # Test token error (should not log ERROR in _validate_token_identity)
-        with patch("proms_mcp.auth.httpx.AsyncClient") as mock_client_class:
-            mock_client = AsyncMock()
-            mock_client_class.return_value.__aenter__.return_value = mock_client
-
-            mock_response = Mock()
-            mock_response.status_code = 401  # Invalid token
-            mock_client.get.return_value = mock_response
-
-            with patch("proms_mcp.auth.logger") as mock_logger:
-                user = await verifier._validate_token_identity(token)
+        await verifier.aclose()
+        patcher, _ = patch_userinfo_api(status_code=401)  # Invalid token
+        with patcher, patch("proms_mcp.auth.logger") as mock_logger:
+            user = await verifier._validate_token_identity(token)
 
-                assert user is None
-                # Verify NO ERROR log for token issues (handled at higher level)
-                mock_logger.error.assert_not_called()
+            assert user is None
+            # Verify NO ERROR log for token issues (handled at higher level)
+            mock_logger.error.assert_not_called()
 
-    @pytest.mark.asyncio
-    async def test_authentication_caching(self) -> None:
+    async def test_authentication_caching(
+        self, verifier: OpenShiftUserVerifier
+    ) -> None:
         """Test that successful authentication results are cached."""
-        verifier = OpenShiftUserVerifier(
-            api_url="https://api.cluster.example.com:6443", ca_cert_path=None
-        )
         token = "cache-test-token"
 
         user_response = {
@@ -588,115 +606,162 @@ class TestOpenShiftUserVerifier:
             "identities": [],
         }
 
-        with patch("proms_mcp.auth.httpx.AsyncClient") as mock_client_class:
-            mock_client = AsyncMock()
-            mock_client_class.return_value.__aenter__.return_value = mock_client
-
-            mock_response = Mock()
-            mock_response.status_code = 200
-            mock_response.content = b'{"kind": "User"}'
-            mock_response.headers = {"content-type": "application/json"}
-            mock_response.text = '{"kind": "User"}'
-            mock_response.json.return_value = user_response
-            mock_client.get.return_value = mock_response
-
+        patcher, requests = patch_userinfo_api(payload=user_response)
+        with patcher:
             # First call - should hit the API
             user1 = await verifier._validate_token_identity(token)
-            assert user1 is not None
-            assert user1.username == "cached-user"
-            assert user1.uid == "cached-uid-123"
+            assert_user(user1, "cached-user", "cached-uid-123")
 
             # Second call with same token - should use cache
             user2 = await verifier._validate_token_identity(token)
-            assert user2 is not None
-            assert user2.username == "cached-user"
-            assert user2.uid == "cached-uid-123"
+            assert_user(user2, "cached-user", "cached-uid-123")
+
+        # Verify API was only called once (first call), second was cached
+        assert len(requests) == 1
+
+    @pytest.mark.parametrize(
+        ("response_kwargs", "expected_requests"),
+        [
+            ({"status_code": 401}, 1),
+            ({"status_code": 403}, 1),
+            ({"content": b"invalid json"}, 2),
+            ({"status_code": 429}, 2),
+            ({"status_code": 503}, 2),
+            ({"error": httpx.ConnectError("Connection failed")}, 2),
+            ({"error": httpx.TimeoutException("Request timed out")}, 2),
+        ],
+    )
+    async def test_negative_caching(
+        self,
+        verifier: OpenShiftUserVerifier,
+        response_kwargs: dict[str, Any],
+        expected_requests: int,
+    ) -> None:
+        """Test that rejected tokens are cached but API outages are not."""
+        patcher, requests = patch_userinfo_api(**response_kwargs)
+        with patcher:
+            assert await verifier._validate_token_identity("bad-token") is None
+            assert await verifier._validate_token_identity("bad-token") is None
+
+        assert len(requests) == expected_requests
+
+    async def test_server_error_logging(self, verifier: OpenShiftUserVerifier) -> None:
+        """Test that an answered but failed lookup is not logged as unreachable."""
+        patcher, _ = patch_userinfo_api(status_code=503)
+        with patcher, patch("proms_mcp.auth.logger") as mock_logger:
+            user = await verifier._validate_token_identity("test-token")
+
+        assert user is None
+        mock_logger.error.assert_called_once_with(
+            "Authentication failed - unexpected OpenShift API response",
+            status_code=503,
+        )
 
-            # Verify API was only called once (first call), second was cached
-            mock_client.get.assert_called_once()
+    async def test_unparsable_response_logging(
+        self, verifier: OpenShiftUserVerifier
+    ) -> None:
+        """Test that a garbled 200 is logged as an API problem, not a bad token."""
+        patcher, _ = patch_userinfo_api(content=b"<html>proxy login</html>")
+        with patcher, patch("proms_mcp.auth.logger") as mock_logger:
+            user = await verifier._validate_token_identity("test-token")
 
-    @pytest.mark.asyncio
-    async def test_auth_cache_ttl_environment_variable(self) -> None:
-        """Test that AUTH_CACHE_TTL_SECONDS environment variable is respected."""
-        import os
-        from unittest.mock import patch
+        assert user is None
+        assert (
+            mock_logger.error.call_args[0][0]
+            == "Authentication failed - unparsable OpenShift API response"
+        )
 
-        # Test with custom TTL
-        with patch.dict(os.environ, {"AUTH_CACHE_TTL_SECONDS": "600"}):
-            # Re-import to get new cache with updated TTL
-            import importlib
+    async def test_unexpected_error_not_cached(
+        self, verifier: OpenShiftUserVerifier
+    ) -> None:
+        """Test that unexpected lookup errors are logged and retried."""
+        patcher, requests = patch_userinfo_api(error=httpx.InvalidURL("Bad URL"))
+        with patcher, patch("proms_mcp.auth.logger") as mock_logger:
+            assert await verifier._validate_token_identity("test-token") is None
+            assert await verifier._validate_token_identity("test-token") is None
 
-            import proms_mcp.auth
+        assert len(requests) == 2
+        assert (
+            mock_logger.error.call_args[0][0]
+            == "Authentication failed - unexpected error"
+        )
+
+    async def test_concurrent_validations_share_one_request(
+        self, verifier: OpenShiftUserVerifier, mock_successful_userinfo_response: dict
+    ) -> None:
+        """Test that concurrent lookups of an uncached token hit the API once."""
+        patcher, requests = patch_userinfo_api(
+            payload=mock_successful_userinfo_response
+        )
+        with patcher:
+            users = await asyncio.gather(
+                *(verifier._validate_token_identity("same-token") for _ in range(50))
+            )
 
-            importlib.reload(proms_mcp.auth)
+        assert len(requests) == 1
+        assert all(user is users[0] for user in users)
+        assert_user(users[0], "testuser", "12345-67890-abcdef")
+        assert verifier._pending == {}
 
-            # Verify the cache was created with the custom TTL
-            assert proms_mcp.auth._AUTH_CACHE_TTL_SECONDS == 600
-            assert proms_mcp.auth._auth_cache.ttl == 600
+    @pytest.fixture
+    def rebuild_auth_cache(self) -> Iterator[Callable[..., None]]:
+        """Rebuild the auth cache with a new TTL, restoring the original after."""
+        original_ttl = proms_mcp.auth._AUTH_CACHE_TTL_SECONDS
+        original_cache = proms_mcp.auth._auth_cache
+        try:
+            yield proms_mcp.auth._rebuild_auth_cache
+        finally:
+            proms_mcp.auth._AUTH_CACHE_TTL_SECONDS = original_ttl
+            proms_mcp.auth._auth_cache = original_cache
+
+    def test_auth_cache_ttl_environment_variable(
+        self, rebuild_auth_cache: Callable[..., None], monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that AUTH_CACHE_TTL_SECONDS environment variable is respected."""
+        monkeypatch.setenv("AUTH_CACHE_TTL_SECONDS", "600")
+        rebuild_auth_cache()
 
-        # Clean up and restore original module state
-        importlib.reload(proms_mcp.auth)
+        # Verify the cache was created with the custom TTL
+        assert proms_mcp.auth._AUTH_CACHE_TTL_SECONDS == 600
+        assert proms_mcp.auth._auth_cache.ttl == 600
 
-    @pytest.mark.asyncio
-    async def test_auth_cache_disable_with_ttl_zero(self) -> None:
+    async def test_auth_cache_disable_with_ttl_zero(
+        self,
+        verifier: OpenShiftUserVerifier,
+        rebuild_auth_cache: Callable[..., None],
+    ) -> None:
         """Test that AUTH_CACHE_TTL_SECONDS=0 disables caching."""
-        import os
-        from unittest.mock import patch
+        rebuild_auth_cache(0)
+
+        # Verify the cache was created with TTL=0
+        assert proms_mcp.auth._AUTH_CACHE_TTL_SECONDS == 0
+        assert proms_mcp.auth._auth_cache.ttl == 0
 
-        # Test cache disable with TTL=0
-        with patch.dict(os.environ, {"AUTH_CACHE_TTL_SECONDS": "0"}):
-            # Re-import to get new cache with TTL=0
-            import importlib
+        # Test that caching is actually disabled
+        token = "disable-cache-test-token"
 
-            import proms_mcp.auth
+        user_response = {
+            "kind": "User",
+            "apiVersion": "user.openshift.io/v1",
+            "metadata": {
+                "name": "no-cache-user",
+                "uid": "no-cache-uid-123",
+                "creationTimestamp": "2023-01-01T00:00:00Z",
+            },
+            "identities": [],
+        }
 
-            importlib.reload(proms_mcp.auth)
+        patcher, requests = patch_userinfo_api(payload=user_response)
+        with patcher:
+            # First call
+            user1 = await verifier._validate_token_identity(token)
+            assert user1 is not None
+            assert user1.username == "no-cache-user"
 
-            # Verify the cache was created with TTL=0
-            assert proms_mcp.auth._AUTH_CACHE_TTL_SECONDS == 0
-            assert proms_mcp.auth._auth_cache.ttl == 0
+            # Second call with same token - should call API again (not cached)
+            user2 = await verifier._validate_token_identity(token)
+            assert user2 is not None
+            assert user2.username == "no-cache-user"
 
-            # Test that caching is actually disabled
-            verifier = proms_mcp.auth.OpenShiftUserVerifier(
-                api_url="https://api.cluster.example.com:6443", ca_cert_path=None
-            )
-            token = "disable-cache-test-token"
-
-            user_response = {
-                "kind": "User",
-                "apiVersion": "user.openshift.io/v1",
-                "metadata": {
-                    "name": "no-cache-user",
-                    "uid": "no-cache-uid-123",
-                    "creationTimestamp": "2023-01-01T00:00:00Z",
-                },
-                "identities": [],
-            }
-
-            with patch("proms_mcp.auth.httpx.AsyncClient") as mock_client_class:
-                mock_client = AsyncMock()
-                mock_client_class.return_value.__aenter__.return_value = mock_client
-
-                mock_response = Mock()
-                mock_response.status_code = 200
-                mock_response.content = b'{"kind": "User"}'
-                mock_response.headers = {"content-type": "application/json"}
-                mock_response.text = '{"kind": "User"}'
-                mock_response.json.return_value = user_response
-                mock_client.get.return_value = mock_response
-
-                # First call
-                user1 = await verifier._validate_token_identity(token)
-                assert user1 is not None
-                assert user1.username == "no-cache-user"
-
-                # Second call with same token - should call API again (not cached)
-                user2 = await verifier._validate_token_identity(token)
-                assert user2 is not None
-                assert user2.username == "no-cache-user"
-
-                # Verify API was called twice (no caching occurred)
-                assert mock_client.get.call_count == 2
-
-        # Clean up and restore original module state
-        importlib.reload(proms_mcp.auth)
+        # Verify API was called twice (no caching occurred)
+        assert len(requests) == 2
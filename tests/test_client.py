@@ -1,6 +1,7 @@
 """Unit tests for client module."""
 
-from unittest.mock import AsyncMock, Mock, patch
+from typing import Any
+from unittest.mock import AsyncMock, patch
 
 import httpx
 import pytest
@@ -12,19 +13,60 @@ from proms_mcp.client import (
 )
 from proms_mcp.config import PrometheusDataSource
 
+DATASOURCE = PrometheusDataSource(
+    name="test-prometheus",
+    url="https://prometheus.example.com",
+    auth_header_name="Authorization",
+    auth_header_value="Bearer test-token",
+)
+DATASOURCE_NO_AUTH = PrometheusDataSource(
+    name="test-prometheus", url="https://prometheus.example.com"
+)
+LONG_QUERY = "up" * 5001  # > 10000 characters (10002 chars)
+
+
+def make_response(payload: Any) -> httpx.Response:
+    """Build a successful JSON response from the Prometheus API."""
+    request = httpx.Request("GET", "https://prometheus.example.com/api/v1/query")
+    return httpx.Response(200, json=payload, request=request)
+
+
+def fail_get(
+    monkeypatch: pytest.MonkeyPatch, client: PrometheusClient, error: Exception
+) -> None:
+    """Make the client's HTTP GET raise the given error for this test."""
+
+    async def get(*args: Any, **kwargs: Any) -> httpx.Response:
+        raise error
+
+    monkeypatch.setattr(client.http_client, "get", get)
+
+
+def make_status_error(status_code: int, text: str) -> httpx.HTTPStatusError:
+    """Build an HTTPStatusError backed by real httpx request/response objects."""
+    request = httpx.Request("GET", "https://prometheus.example.com/api/v1/query")
+    response = httpx.Response(status_code, text=text, request=request)
+    return httpx.HTTPStatusError(text, request=request, response=response)
+
 
 class TestPrometheusClient:
     """Test PrometheusClient class."""
 
-    def setup_method(self) -> None:
-        """Setup test fixtures."""
-        self.datasource = PrometheusDataSource(
-            name="test-prometheus",
-            url="https://prometheus.example.com",
-            auth_header_name="Authorization",
-            auth_header_value="Bearer test-token",
+    @pytest.fixture(scope="class")
+    def client(self) -> PrometheusClient:
+        """Client shared by the class's tests, backed by a stub HTTP client.
+
+        Tests only patch http_client.get, and each patch is undone on exit.
+        """
+        return PrometheusClient(
+            DATASOURCE, timeout=30, http_client=AsyncMock(spec=httpx.AsyncClient)
         )
-        self.client = PrometheusClient(self.datasource, timeout=30)
+
+    @pytest.fixture(autouse=True)
+    def setup_client(self, client: PrometheusClient) -> None:
+        """Expose the shared fixtures as attributes for the test methods."""
+        self.datasource = DATASOURCE
+        self.client = client
 
     def test_initialization(self) -> None:
         """Test client initialization."""
@@ -34,52 +76,32 @@ class TestPrometheusClient:
 
     def test_initialization_without_auth(self) -> None:
         """Test client initialization without auth headers."""
-        datasource = PrometheusDataSource(
-            name="test-prometheus",
-            url="https://prometheus.example.com",
-        )
-        client = PrometheusClient(datasource)
-        assert client.datasource == datasource
-
-    def test_validate_promql_valid_queries(self) -> None:
-        """Test validation of valid PromQL queries."""
-        valid_queries = [
-            "up",
-            "rate(http_requests_total[5m])",
-            "sum(rate(cpu_usage[1h]))",
-            "histogram_quantile(0.95, rate(http_duration_bucket[5d]))",
-        ]
-
-        for query in valid_queries:
-            # Should not raise exception
-            self.client._validate_promql(query)
-
-    def test_validate_promql_basic_queries(self) -> None:
-        """Test basic validation passes valid queries."""
-        valid_queries = [
-            "rate(metric[1y])",  # Year range
-            "rate(metric[1w])",  # Week range
-            '{job=~".*"*}',  # Complex regex
-            "metric[9999s]",  # Large time range
-        ]
-
-        for query in valid_queries:
-            # Basic validation should pass these queries
+        client = PrometheusClient(DATASOURCE_NO_AUTH)
+        assert client.datasource == DATASOURCE_NO_AUTH
+
+    @pytest.mark.parametrize(
+        "query,error",
+        [
+            ("up", None),
+            ("rate(http_requests_total[5m])", None),
+            ("sum(rate(cpu_usage[1h]))", None),
+            ("histogram_quantile(0.95, rate(http_duration_bucket[5d]))", None),
+            ("rate(metric[1y])", None),  # Year range
+            ("rate(metric[1w])", None),  # Week range
+            ('{job=~".*"*}', None),  # Complex regex
+            ("metric[9999s]", None),  # Large time range
+            ("", "Query cannot be empty"),
+            ("   ", "Query cannot be empty"),
+            (LONG_QUERY, "Query too long"),
+        ],
+    )
+    def test_validate_promql(self, query: str, error: str | None) -> None:
+        """Test PromQL validation accepts valid queries and rejects bad ones."""
+        if error is None:
             self.client._validate_promql(query)
-
-    def test_validate_promql_empty_query(self) -> None:
-        """Test validation of empty queries."""
-        with pytest.raises(PrometheusClientError, match="Query cannot be empty"):
-            self.client._validate_promql("")
-
-        with pytest.raises(PrometheusClientError, match="Query cannot be empty"):
-            self.client._validate_promql("   ")
-
-    def test_validate_promql_too_long(self) -> None:
-        """Test validation of overly long queries."""
-        long_query = "up" * 5001  # > 10000 characters (10002 chars)
-        with pytest.raises(PrometheusClientError, match="Query too long"):
-            self.client._validate_promql(long_query)
+        else:
+            with pytest.raises(PrometheusClientError, match=error):
+                self.client._validate_promql(query)
 
     def test_format_response(self) -> None:
         """Test response formatting."""
@@ -107,14 +129,31 @@ class TestPrometheusClient:
         assert response["error"] == error
         # Timestamp and correlation_id removed from response format
 
-    @pytest.mark.asyncio
+    def test_format_response_without_query(self) -> None:
+        """Test response formatting without query parameter."""
+        data = {"status": "success", "data": {"result": []}}
+
+        response = self.client._format_response(data)
+
+        assert response["status"] == "success"
+        assert response["datasource"] == "test-prometheus"
+        assert response["query"] is None
+        assert response["data"] == data
+
+    def test_format_error_without_query(self) -> None:
+        """Test error formatting without query parameter."""
+        error = "Test error message"
+
+        response = self.client._format_error(error)
+
+        assert response["status"] == "error"
+        assert response["datasource"] == "test-prometheus"
+        assert response["query"] is None
+        assert response["error"] == error
+
     async def test_query_instant_success(self) -> None:
         """Test successful instant query."""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.content = b'{"status": "success", "data": {"result": []}}'
-        mock_response.headers = {"content-type": "application/json"}
-        mock_response.json.return_value = {"status": "success", "data": {"result": []}}
+        mock_response = make_response({"status": "success", "data": {"result": []}})
 
         with patch.object(
             self.client.http_client, "get", new_callable=AsyncMock
@@ -128,14 +167,24 @@ class TestPrometheusClient:
             assert result["query"] == "up"
             mock_get.assert_called_once()
 
-    @pytest.mark.asyncio
+    async def test_injected_http_client(self) -> None:
+        """Test that a provided HTTP client is used instead of building one."""
+        http_client = AsyncMock(spec=httpx.AsyncClient)
+        http_client.get.return_value = make_response(
+            {"status": "success", "data": {"result": []}}
+        )
+        async with PrometheusClient(DATASOURCE, http_client=http_client) as client:
+            result = await client.query_instant("up")
+
+        assert client.http_client is http_client
+        assert result["status"] == "success"
+        http_client.get.assert_awaited_once()
+        # The caller owns an injected client, so exiting leaves it open
+        http_client.aclose.assert_not_awaited()
+
     async def test_query_instant_with_mock_response(self) -> None:
         """Test instant query with mocked successful response."""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.content = b'{"status": "success", "data": {"result": []}}'
-        mock_response.headers = {"content-type": "application/json"}
-        mock_response.json.return_value = {"status": "success", "data": {"result": []}}
+        mock_response = make_response({"status": "success", "data": {"result": []}})
 
         with patch.object(self.client.http_client, "get", return_value=mock_response):
             result = await self.client.query_instant("up")
@@ -143,64 +192,40 @@ class TestPrometheusClient:
         assert result["status"] == "success"
         assert result["datasource"] == "test-prometheus"
 
-    @pytest.mark.asyncio
-    async def test_query_instant_http_error(self) -> None:
+    async def test_query_instant_http_error(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
         """Test instant query with HTTP error."""
-        mock_response = Mock()
-        mock_response.status_code = 400
-        mock_response.text = "Bad Request"
-
-        with patch.object(
-            self.client.http_client, "get", new_callable=AsyncMock
-        ) as mock_get:
-            mock_get.side_effect = httpx.HTTPStatusError(
-                "Bad Request", request=Mock(), response=mock_response
-            )
+        fail_get(monkeypatch, self.client, make_status_error(400, "Bad Request"))
 
-            result = await self.client.query_instant("up")
+        result = await self.client.query_instant("up")
 
-            assert result["status"] == "error"
-            assert "INVALID_QUERY" in result["error"]
+        assert result["status"] == "error"
+        assert "INVALID_QUERY" in result["error"]
 
-    @pytest.mark.asyncio
-    async def test_query_instant_auth_error(self) -> None:
+    async def test_query_instant_auth_error(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
         """Test instant query with authentication error."""
-        mock_response = Mock()
-        mock_response.status_code = 401
-
-        with patch.object(
-            self.client.http_client, "get", new_callable=AsyncMock
-        ) as mock_get:
-            mock_get.side_effect = httpx.HTTPStatusError(
-                "Unauthorized", request=Mock(), response=mock_response
-            )
+        fail_get(monkeypatch, self.client, make_status_error(401, "Unauthorized"))
 
-            result = await self.client.query_instant("up")
+        result = await self.client.query_instant("up")
 
-            assert result["status"] == "error"
-            assert "AUTHENTICATION_FAILED" in result["error"]
+        assert result["status"] == "error"
+        assert "AUTHENTICATION_FAILED" in result["error"]
 
-    @pytest.mark.asyncio
-    async def test_query_instant_timeout(self) -> None:
+    async def test_query_instant_timeout(self, monkeypatch: pytest.MonkeyPatch) -> None:
         """Test instant query with timeout."""
-        with patch.object(
-            self.client.http_client, "get", new_callable=AsyncMock
-        ) as mock_get:
-            mock_get.side_effect = httpx.TimeoutException("Timeout")
+        fail_get(monkeypatch, self.client, httpx.TimeoutException("Timeout"))
 
-            result = await self.client.query_instant("up")
+        result = await self.client.query_instant("up")
 
-            assert result["status"] == "error"
-            assert "TIMEOUT" in result["error"]
+        assert result["status"] == "error"
+        assert "TIMEOUT" in result["error"]
 
-    @pytest.mark.asyncio
     async def test_query_range_success(self) -> None:
         """Test successful range query."""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.content = b'{"status": "success", "data": {"result": []}}'
-        mock_response.headers = {"content-type": "application/json"}
-        mock_response.json.return_value = {"status": "success", "data": {"result": []}}
+        mock_response = make_response({"status": "success", "data": {"result": []}})
 
         with patch.object(
             self.client.http_client, "get", new_callable=AsyncMock
@@ -216,176 +241,110 @@ class TestPrometheusClient:
             assert result["query"] == "up"
             mock_get.assert_called_once()
 
-    @pytest.mark.asyncio
-    async def test_get_metric_names_success(self) -> None:
-        """Test successful metric names retrieval."""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.content = (
-            b'{"status": "success", "data": ["up", "cpu_usage", "memory_usage"]}'
-        )
-        mock_response.headers = {"content-type": "application/json"}
-        mock_response.json.return_value = {
-            "status": "success",
-            "data": ["up", "cpu_usage", "memory_usage"],
-        }
-
-        with patch.object(
-            self.client.http_client, "get", new_callable=AsyncMock
-        ) as mock_get:
-            mock_get.return_value = mock_response
-
-            result = await self.client.get_metric_names()
-
-            assert result["status"] == "success"
-            assert result["datasource"] == "test-prometheus"
-            mock_get.assert_called_once()
-
-    @pytest.mark.asyncio
-    async def test_get_metric_metadata_success(self) -> None:
-        """Test successful metric metadata retrieval."""
-        mock_response = Mock()
-        mock_response.json.return_value = {
-            "status": "success",
-            "data": {
-                "up": [
-                    {
-                        "type": "gauge",
-                        "help": "1 if the instance is healthy",
-                        "unit": "",
-                    }
-                ]
-            },
-        }
-
-        with patch.object(
-            self.client.http_client, "get", new_callable=AsyncMock
-        ) as mock_get:
-            mock_get.return_value = mock_response
-
-            result = await self.client.get_metric_metadata("up")
-
-            assert result["status"] == "success"
-            assert result["datasource"] == "test-prometheus"
-            mock_get.assert_called_once()
-
-    @pytest.mark.asyncio
-    async def test_get_series_success(self) -> None:
-        """Test successful series retrieval."""
-        mock_response = Mock()
-        mock_response.json.return_value = {
-            "status": "success",
-            "data": [
-                {"__name__": "up", "job": "prometheus", "instance": "localhost:9090"}
-            ],
-        }
-
-        with patch.object(
-            self.client.http_client, "get", new_callable=AsyncMock
-        ) as mock_get:
-            mock_get.return_value = mock_response
-
-            result = await self.client.get_series("{up}")
-
-            assert result["status"] == "success"
-            assert result["datasource"] == "test-prometheus"
-            mock_get.assert_called_once()
-
-    @pytest.mark.asyncio
-    async def test_get_label_values_success(self) -> None:
-        """Test successful label values retrieval."""
-        mock_response = Mock()
-        mock_response.json.return_value = {
-            "status": "success",
-            "data": ["prometheus", "node-exporter", "alertmanager"],
-        }
+    @pytest.mark.parametrize(
+        ("method", "args", "payload"),
+        [
+            pytest.param(
+                "get_metric_names",
+                (),
+                {"status": "success", "data": ["up", "cpu_usage", "memory_usage"]},
+                id="metric-names",
+            ),
+            pytest.param(
+                "get_metric_metadata",
+                ("up",),
+                {
+                    "status": "success",
+                    "data": {
+                        "up": [
+                            {
+                                "type": "gauge",
+                                "help": "1 if the instance is healthy",
+                                "unit": "",
+                            }
+                        ]
+                    },
+                },
+                id="metric-metadata",
+            ),
+            pytest.param(
+                "get_series",
+                ("{up}",),
+                {
+                    "status": "success",
+                    "data": [
+                        {
+                            "__name__": "up",
+                            "job": "prometheus",
+                            "instance": "localhost:9090",
+                        }
+                    ],
+                },
+                id="series",
+            ),
+            pytest.param(
+                "get_label_values",
+                ("job",),
+                {
+                    "status": "success",
+                    "data": ["prometheus", "node-exporter", "alertmanager"],
+                },
+                id="label-values",
+            ),
+        ],
+    )
+    async def test_metadata_endpoint_success(
+        self, method: str, args: tuple[str, ...], payload: dict[str, Any]
+    ) -> None:
+        """Test successful retrieval from the metadata endpoints."""
+        mock_response = make_response(payload)
 
         with patch.object(
             self.client.http_client, "get", new_callable=AsyncMock
         ) as mock_get:
             mock_get.return_value = mock_response
 
-            result = await self.client.get_label_values("job")
+            result = await getattr(self.client, method)(*args)
 
             assert result["status"] == "success"
             assert result["datasource"] == "test-prometheus"
             mock_get.assert_called_once()
 
-    @pytest.mark.asyncio
     async def test_context_manager(self) -> None:
         """Test async context manager usage."""
-        async with self.client as client:
-            assert client == self.client
+        # Use a dedicated client: exiting the context closes its HTTP client
+        prometheus_client = PrometheusClient(self.datasource)
+        async with prometheus_client as client:
+            assert client == prometheus_client
 
-        # Verify http_client.aclose was called
-        # Note: In real usage, this would close the HTTP client
+        assert prometheus_client.http_client.is_closed
 
     # NEW TESTS FOR MISSING COVERAGE
 
-    @pytest.mark.asyncio
-    async def test_get_metric_names_error(self) -> None:
-        """Test get_metric_names with error."""
-        with patch.object(
-            self.client.http_client, "get", new_callable=AsyncMock
-        ) as mock_get:
-            mock_get.side_effect = Exception("Connection error")
-
-            result = await self.client.get_metric_names()
-
-            assert result["status"] == "error"
-            assert "PROMETHEUS_UNAVAILABLE" in result["error"]
-            assert "Connection error" in result["error"]
-
-    @pytest.mark.asyncio
-    async def test_get_metric_metadata_error(self) -> None:
-        """Test get_metric_metadata with error."""
-        with patch.object(
-            self.client.http_client, "get", new_callable=AsyncMock
-        ) as mock_get:
-            mock_get.side_effect = Exception("Connection error")
-
-            result = await self.client.get_metric_metadata("up")
-
-            assert result["status"] == "error"
-            assert "PROMETHEUS_UNAVAILABLE" in result["error"]
-            assert "Connection error" in result["error"]
-
-    @pytest.mark.asyncio
-    async def test_get_series_error(self) -> None:
-        """Test get_series with error."""
-        with patch.object(
-            self.client.http_client, "get", new_callable=AsyncMock
-        ) as mock_get:
-            mock_get.side_effect = Exception("Connection error")
-
-            result = await self.client.get_series("{up}")
-
-            assert result["status"] == "error"
-            assert "PROMETHEUS_UNAVAILABLE" in result["error"]
-            assert "Connection error" in result["error"]
-
-    @pytest.mark.asyncio
-    async def test_get_label_values_error(self) -> None:
-        """Test get_label_values with error."""
-        with patch.object(
-            self.client.http_client, "get", new_callable=AsyncMock
-        ) as mock_get:
-            mock_get.side_effect = Exception("Connection error")
+    @pytest.mark.parametrize(
+        ("method", "args"),
+        [
+            pytest.param("get_metric_names", (), id="metric-names"),
+            pytest.param("get_metric_metadata", ("up",), id="metric-metadata"),
+            pytest.param("get_series", ("{up}",), id="series"),
+            pytest.param("get_label_values", ("job",), id="label-values"),
+        ],
+    )
+    async def test_metadata_endpoint_error(
+        self, monkeypatch: pytest.MonkeyPatch, method: str, args: tuple[str, ...]
+    ) -> None:
+        """Test metadata endpoints when Prometheus is unreachable."""
+        fail_get(monkeypatch, self.client, Exception("Connection error"))
 
-            result = await self.client.get_label_values("job")
+        result = await getattr(self.client, method)(*args)
 
-            assert result["status"] == "error"
-            assert "PROMETHEUS_UNAVAILABLE" in result["error"]
-            assert "Connection error" in result["error"]
+        assert result["status"] == "error"
+        assert "PROMETHEUS_UNAVAILABLE" in result["error"]
+        assert "Connection error" in result["error"]
 
-    @pytest.mark.asyncio
     async def test_query_instant_with_time_parameter(self) -> None:
         """Test instant query with time parameter."""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.content = b'{"status": "success", "data": {"result": []}}'
-        mock_response.headers = {"content-type": "application/json"}
-        mock_response.json.return_value = {"status": "success", "data": {"result": []}}
+        mock_response = make_response({"status": "success", "data": {"result": []}})
 
         with patch.object(
             self.client.http_client, "get", new_callable=AsyncMock
@@ -400,41 +359,32 @@ class TestPrometheusClient:
             call_args = mock_get.call_args
             assert call_args[1]["params"]["time"] == "2024-01-01T00:00:00Z"
 
-    @pytest.mark.asyncio
-    async def test_query_instant_general_http_error(self) -> None:
+    async def test_query_instant_general_http_error(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
         """Test instant query with general HTTP error (not 400 or 401)."""
-        mock_response = Mock()
-        mock_response.status_code = 500
-        mock_response.text = "Internal Server Error"
-
-        with patch.object(
-            self.client.http_client, "get", new_callable=AsyncMock
-        ) as mock_get:
-            mock_get.side_effect = httpx.HTTPStatusError(
-                "Internal Server Error", request=Mock(), response=mock_response
-            )
+        fail_get(
+            monkeypatch, self.client, make_status_error(500, "Internal Server Error")
+        )
 
-            result = await self.client.query_instant("up")
+        result = await self.client.query_instant("up")
 
-            assert result["status"] == "error"
-            assert "PROMETHEUS_UNAVAILABLE" in result["error"]
-            assert "HTTP 500" in result["error"]
+        assert result["status"] == "error"
+        assert "PROMETHEUS_UNAVAILABLE" in result["error"]
+        assert "HTTP 500" in result["error"]
 
-    @pytest.mark.asyncio
-    async def test_query_instant_general_exception(self) -> None:
+    async def test_query_instant_general_exception(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
         """Test instant query with general exception."""
-        with patch.object(
-            self.client.http_client, "get", new_callable=AsyncMock
-        ) as mock_get:
-            mock_get.side_effect = Exception("Network error")
+        fail_get(monkeypatch, self.client, Exception("Network error"))
 
-            result = await self.client.query_instant("up")
+        result = await self.client.query_instant("up")
 
-            assert result["status"] == "error"
-            assert "PROMETHEUS_UNAVAILABLE" in result["error"]
-            assert "Network error" in result["error"]
+        assert result["status"] == "error"
+        assert "PROMETHEUS_UNAVAILABLE" in result["error"]
+        assert "Network error" in result["error"]
 
-    @pytest.mark.asyncio
     async def test_query_range_validation_error(self) -> None:
         """Test range query with validation error."""
         result = await self.client.query_range("", "start", "end", "step")
@@ -443,41 +393,17 @@ class TestPrometheusClient:
         assert "INVALID_QUERY" in result["error"]
         assert "Query cannot be empty" in result["error"]
 
-    def test_format_response_without_query(self) -> None:
-        """Test response formatting without query parameter."""
-        data = {"status": "success", "data": {"result": []}}
-
-        response = self.client._format_response(data)
-
-        assert response["status"] == "success"
-        assert response["datasource"] == "test-prometheus"
-        assert response["query"] is None
-        assert response["data"] == data
-
-    def test_format_error_without_query(self) -> None:
-        """Test error formatting without query parameter."""
-        error = "Test error message"
-
-        response = self.client._format_error(error)
-
-        assert response["status"] == "error"
-        assert response["datasource"] == "test-prometheus"
-        assert response["query"] is None
-        assert response["error"] == error
-
 
-def test_get_prometheus_client() -> None:
+@pytest.mark.parametrize(("query_timeout", "expected"), [("60", 60), (None, 30)])
+def test_get_prometheus_client(
+    monkeypatch: pytest.MonkeyPatch, query_timeout: str | None, expected: int
+) -> None:
     """Test get_prometheus_client factory function."""
-    datasource = PrometheusDataSource(
-        name="test-prometheus", url="https://prometheus.example.com"
-    )
-
-    with patch.dict("os.environ", {"QUERY_TIMEOUT": "60"}):
-        client = get_prometheus_client(datasource)
-        assert client.datasource == datasource
-        assert client.timeout == 60
-
-    # Test default timeout
-    with patch.dict("os.environ", {}, clear=True):
-        client = get_prometheus_client(datasource)
-        assert client.timeout == 30
+    if query_timeout is None:
+        monkeypatch.delenv("QUERY_TIMEOUT", raising=False)
+    else:
+        monkeypatch.setenv("QUERY_TIMEOUT", query_timeout)
+
+    client = get_prometheus_client(DATASOURCE_NO_AUTH)
+    assert client.datasource == DATASOURCE_NO_AUTH
+    assert client.timeout == expected
@@ -1,9 +1,11 @@
 """Unit tests for config module."""
 
-import tempfile
+import os
+import textwrap
 from pathlib import Path
 from unittest.mock import patch
 
+import pytest
 import yaml
 
 from proms_mcp.config import (
@@ -44,40 +46,38 @@ class TestPrometheusDataSource:
 class TestConfigLoader:
     """Test ConfigLoader class."""
 
-    def setup_method(self) -> None:
-        """Setup test fixtures."""
-        self.temp_dir = tempfile.mkdtemp()
-        self.datasources_file = Path(self.temp_dir) / "datasources.yaml"
+    @pytest.fixture(autouse=True)
+    def setup_config_loader(self, tmp_path: Path) -> None:
+        """Point a ConfigLoader at a datasources file in a per-test directory."""
+        self.datasources_file = tmp_path / "datasources.yaml"
         self.config_loader = ConfigLoader(str(self.datasources_file))
 
-    def create_test_yaml(self, content: dict) -> Path:
+    def create_test_yaml(self, content: str) -> Path:
         """Helper to create test YAML file."""
-        with open(self.datasources_file, "w") as f:
-            yaml.dump(content, f)
+        self.datasources_file.write_text(textwrap.dedent(content))
         return self.datasources_file
 
     def test_load_valid_datasources(self) -> None:
         """Test loading valid datasources."""
-        content = {
-            "apiVersion": 1,
-            "prune": True,
-            "datasources": [
-                {
-                    "name": "prod-prometheus",
-                    "type": "prometheus",
-                    "url": "https://prometheus-prod.example.com",
-                    "jsonData": {"httpHeaderName1": "Authorization"},
-                    "secureJsonData": {"httpHeaderValue1": "Bearer prod-token"},
-                },
-                {
-                    "name": "staging-prometheus",
-                    "type": "prometheus",
-                    "url": "https://prometheus-staging.example.com",
-                    "jsonData": {"httpHeaderName1": "Authorization"},
-                    "secureJsonData": {"httpHeaderValue1": "Bearer staging-token"},
-                },
-            ],
-        }
+        content = """
+            apiVersion: 1
+            prune: true
+            datasources:
+            - name: prod-prometheus
+              type: prometheus
+              url: https://prometheus-prod.example.com
+              jsonData:
+                httpHeaderName1: Authorization
+              secureJsonData:
+                httpHeaderValue1: Bearer prod-token
+            - name: staging-prometheus
+              type: prometheus
+              url: https://prometheus-staging.example.com
+              jsonData:
+                httpHeaderName1: Authorization
+              secureJsonData:
+                httpHeaderValue1: Bearer staging-token
+        """
 
         self.create_test_yaml(content)
         datasources = self.config_loader.load_datasources()
@@ -92,24 +92,45 @@ class TestConfigLoader:
         assert prod_ds.auth_header_name == "Authorization"
         assert prod_ds.auth_header_value == "Bearer prod-token"
 
+    def test_repeated_header_names_are_shared(self) -> None:
+        """Test that identical header names are interned across datasources."""
+        content = """
+            apiVersion: 1
+            datasources:
+            - name: ds1
+              type: prometheus
+              url: https://prometheus1.example.com
+              jsonData:
+                httpHeaderName1: Authorization
+            - name: ds2
+              type: prometheus
+              url: https://prometheus2.example.com
+              jsonData:
+                httpHeaderName1: Authorization
+        """
+
+        self.create_test_yaml(content)
+        datasources = self.config_loader.load_datasources()
+
+        assert (
+            datasources["ds1"].auth_header_name is datasources["ds2"].auth_header_name
+        )
+
     def test_skip_non_prometheus_datasources(self) -> None:
         """Test that non-prometheus datasources are skipped."""
-        content = {
-            "apiVersion": 1,
-            "datasources": [
-                {
-                    "name": "prometheus-ds",
-                    "type": "prometheus",
-                    "url": "https://prometheus.example.com",
-                },
-                {"name": "loki-ds", "type": "loki", "url": "https://loki.example.com"},
-                {
-                    "name": "influx-ds",
-                    "type": "influxdb",
-                    "url": "https://influx.example.com",
-                },
-            ],
-        }
+        content = """
+            apiVersion: 1
+            datasources:
+            - name: prometheus-ds
+              type: prometheus
+              url: https://prometheus.example.com
+            - name: loki-ds
+              type: loki
+              url: https://loki.example.com
+            - name: influx-ds
+              type: influxdb
+              url: https://influx.example.com
+        """
 
         self.create_test_yaml(content)
         datasources = self.config_loader.load_datasources()
@@ -121,7 +142,7 @@ class TestConfigLoader:
 
     def test_empty_file(self) -> None:
         """Test loading from empty file."""
-        self.create_test_yaml({})
+        self.create_test_yaml("")
         datasources = self.config_loader.load_datasources()
         assert len(datasources) == 0
 
@@ -131,10 +152,17 @@ class TestConfigLoader:
         datasources = config_loader.load_datasources()
         assert len(datasources) == 0
 
+    def test_path_through_regular_file(self, tmp_path: Path) -> None:
+        """Test a datasources path whose parent is a file, not a directory."""
+        not_a_dir = tmp_path / "hostname"
+        not_a_dir.write_text("host")
+        config_loader = ConfigLoader(str(not_a_dir / "datasources.yaml"))
+
+        assert config_loader.load_datasources() == {}
+
     def test_invalid_yaml_file(self) -> None:
         """Test handling of invalid YAML file."""
-        with open(self.datasources_file, "w") as f:
-            f.write("invalid: yaml: content: [")
+        self.datasources_file.write_text("invalid: yaml: content: [")
 
         # Should not raise exception, just return empty dict
         datasources = self.config_loader.load_datasources()
@@ -142,7 +170,10 @@ class TestConfigLoader:
 
     def test_yaml_without_datasources(self) -> None:
         """Test YAML file without datasources section."""
-        content = {"apiVersion": 1, "prune": True}
+        content = """
+            apiVersion: 1
+            prune: true
+        """
 
         self.create_test_yaml(content)
         datasources = self.config_loader.load_datasources()
@@ -150,16 +181,13 @@ class TestConfigLoader:
 
     def test_get_datasource(self) -> None:
         """Test getting specific datasource."""
-        content = {
-            "apiVersion": 1,
-            "datasources": [
-                {
-                    "name": "test-prometheus",
-                    "type": "prometheus",
-                    "url": "https://prometheus.example.com",
-                }
-            ],
-        }
+        content = """
+            apiVersion: 1
+            datasources:
+            - name: test-prometheus
+              type: prometheus
+              url: https://prometheus.example.com
+        """
 
         self.create_test_yaml(content)
         self.config_loader.load_datasources()
@@ -173,21 +201,16 @@ class TestConfigLoader:
 
     def test_list_datasource_names(self) -> None:
         """Test listing datasource names."""
-        content = {
-            "apiVersion": 1,
-            "datasources": [
-                {
-                    "name": "ds1",
-                    "type": "prometheus",
-                    "url": "https://prometheus1.example.com",
-                },
-                {
-                    "name": "ds2",
-                    "type": "prometheus",
-                    "url": "https://prometheus2.example.com",
-                },
-            ],
-        }
+        content = """
+            apiVersion: 1
+            datasources:
+            - name: ds1
+              type: prometheus
+              url: https://prometheus1.example.com
+            - name: ds2
+              type: prometheus
+              url: https://prometheus2.example.com
+        """
 
         self.create_test_yaml(content)
         self.config_loader.load_datasources()
@@ -198,16 +221,13 @@ class TestConfigLoader:
     def test_reload_datasources(self) -> None:
         """Test reloading datasources."""
         # Initial load
-        content1 = {
-            "apiVersion": 1,
-            "datasources": [
-                {
-                    "name": "initial-ds",
-                    "type": "prometheus",
-                    "url": "https://initial.example.com",
-                }
-            ],
-        }
+        content1 = """
+            apiVersion: 1
+            datasources:
+            - name: initial-ds
+              type: prometheus
+              url: https://initial.example.com
+        """
 
         self.create_test_yaml(content1)
         datasources = self.config_loader.load_datasources()
@@ -215,16 +235,13 @@ class TestConfigLoader:
         assert "initial-ds" in datasources
 
         # Update file
-        content2 = {
-            "apiVersion": 1,
-            "datasources": [
-                {
-                    "name": "updated-ds",
-                    "type": "prometheus",
-                    "url": "https://updated.example.com",
-                }
-            ],
-        }
+        content2 = """
+            apiVersion: 1
+            datasources:
+            - name: updated-ds
+              type: prometheus
+              url: https://updated.example.com
+        """
 
         self.create_test_yaml(content2)
         datasources = self.config_loader.reload()
@@ -232,18 +249,77 @@ class TestConfigLoader:
         assert "updated-ds" in datasources
         assert "initial-ds" not in datasources
 
+    def test_reload_keeps_datasources_on_invalid_yaml(self) -> None:
+        """Test that a failed reload leaves the loaded datasources in place."""
+        content = """
+            apiVersion: 1
+            datasources:
+            - name: kept-ds
+              type: prometheus
+              url: https://kept.example.com
+        """
+
+        self.create_test_yaml(content)
+        self.config_loader.load_datasources()
+
+        self.datasources_file.write_text("invalid: yaml: content: [")
+        datasources = self.config_loader.reload()
+        assert list(datasources) == ["kept-ds"]
+
+    def test_reload_after_file_deleted(self) -> None:
+        """Test that reloading a deleted file drops the loaded datasources."""
+        content = """
+            apiVersion: 1
+            datasources:
+            - name: deleted-ds
+              type: prometheus
+              url: https://deleted.example.com
+        """
+
+        self.create_test_yaml(content)
+        self.config_loader.load_datasources()
+
+        self.datasources_file.unlink()
+        datasources = self.config_loader.reload()
+        assert datasources == {}
+        assert self.config_loader.datasources == {}
+        assert self.config_loader.list_datasource_names() == []
+
+    def test_load_is_cached_on_unchanged_file(self) -> None:
+        """Test that an unchanged file is not re-parsed on repeated loads."""
+        content = """
+            apiVersion: 1
+            datasources:
+            - name: cached-ds
+              type: prometheus
+              url: https://cached.example.com
+        """
+        self.create_test_yaml(content)
+
+        with patch("proms_mcp.config.yaml.load", wraps=yaml.load) as load:
+            self.config_loader.load_datasources()
+            datasources = self.config_loader.load_datasources()
+            assert load.call_count == 1
+            assert "cached-ds" in datasources
+
+            # Touching the file invalidates the cached parse
+            stat = self.datasources_file.stat()
+            os.utime(
+                self.datasources_file,
+                ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000),
+            )
+            self.config_loader.load_datasources()
+            assert load.call_count == 2
+
     def test_parse_datasource_with_missing_required_fields(self) -> None:
         """Test parsing datasource with missing required fields."""
         # Test with missing name
-        content = {
-            "apiVersion": 1,
-            "datasources": [
-                {
-                    "type": "prometheus",
-                    "url": "https://prometheus.example.com",
-                }
-            ],
-        }
+        content = """
+            apiVersion: 1
+            datasources:
+            - type: prometheus
+              url: https://prometheus.example.com
+        """
 
         self.create_test_yaml(content)
         datasources = self.config_loader.load_datasources()
@@ -251,15 +327,12 @@ class TestConfigLoader:
         assert len(datasources) == 0
 
         # Test with missing url
-        content = {
-            "apiVersion": 1,
-            "datasources": [
-                {
-                    "name": "test-prometheus",
-                    "type": "prometheus",
-                }
-            ],
-        }
+        content = """
+            apiVersion: 1
+            datasources:
+            - name: test-prometheus
+              type: prometheus
+        """
 
         self.create_test_yaml(content)
         datasources = self.config_loader.load_datasources()
@@ -269,18 +342,16 @@ class TestConfigLoader:
     def test_parse_datasource_with_partial_auth_config(self) -> None:
         """Test parsing datasource with partial auth configuration."""
         # Test with only httpHeaderName1 (missing httpHeaderValue1)
-        content = {
-            "apiVersion": 1,
-            "datasources": [
-                {
-                    "name": "partial-auth-ds",
-                    "type": "prometheus",
-                    "url": "https://prometheus.example.com",
-                    "jsonData": {"httpHeaderName1": "Authorization"},
-                    # Missing secureJsonData
-                }
-            ],
-        }
+        content = """
+            apiVersion: 1
+            datasources:
+            - name: partial-auth-ds
+              type: prometheus
+              url: https://prometheus.example.com
+              jsonData:
+                httpHeaderName1: Authorization
+              # Missing secureJsonData
+        """
 
         self.create_test_yaml(content)
         # Clear previous datasources
@@ -293,18 +364,16 @@ class TestConfigLoader:
         assert ds.auth_header_value is None  # Should be None when missing
 
         # Test with only httpHeaderValue1 (missing httpHeaderName1)
-        content = {
-            "apiVersion": 1,
-            "datasources": [
-                {
-                    "name": "partial-auth-ds2",
-                    "type": "prometheus",
-                    "url": "https://prometheus.example.com",
-                    "secureJsonData": {"httpHeaderValue1": "Bearer token"},
-                    # Missing jsonData
-                }
-            ],
-        }
+        content = """
+            apiVersion: 1
+            datasources:
+            - name: partial-auth-ds2
+              type: prometheus
+              url: https://prometheus.example.com
+              secureJsonData:
+                httpHeaderValue1: Bearer token
+              # Missing jsonData
+        """
 
         self.create_test_yaml(content)
         # Clear previous datasources
@@ -318,33 +387,28 @@ class TestConfigLoader:
 
     def test_load_datasources_with_complex_structure(self) -> None:
         """Test loading datasources with complex YAML structure."""
-        content = {
-            "apiVersion": 1,
-            "prune": True,
-            "datasources": [
-                {
-                    "name": "complex-prometheus",
-                    "type": "prometheus",
-                    "url": "https://prometheus-complex.example.com",
-                    "access": "proxy",
-                    "editable": False,
-                    "orgId": 1,
-                    "version": 1,
-                    "jsonData": {
-                        "httpHeaderName1": "Authorization",
-                        "httpMethod": "GET",
-                        "timeInterval": "30s",
-                        "queryTimeout": "60s",
-                        "other_config": "ignored",
-                    },
-                    "secureJsonData": {
-                        "httpHeaderValue1": "Bearer complex-token",
-                        "other_secret": "ignored",
-                    },
-                    "extra_field": "should_be_ignored",
-                }
-            ],
-        }
+        content = """
+            apiVersion: 1
+            prune: true
+            datasources:
+            - name: complex-prometheus
+              type: prometheus
+              url: https://prometheus-complex.example.com
+              access: proxy
+              editable: false
+              orgId: 1
+              version: 1
+              jsonData:
+                httpHeaderName1: Authorization
+                httpMethod: GET
+                timeInterval: 30s
+                queryTimeout: 60s
+                other_config: ignored
+              secureJsonData:
+                httpHeaderValue1: Bearer complex-token
+                other_secret: ignored
+              extra_field: should_be_ignored
+        """
 
         self.create_test_yaml(content)
         datasources = self.config_loader.load_datasources()
@@ -359,18 +423,15 @@ class TestConfigLoader:
 
     def test_load_datasources_with_empty_auth_sections(self) -> None:
         """Test loading datasources with empty auth sections."""
-        content = {
-            "apiVersion": 1,
-            "datasources": [
-                {
-                    "name": "empty-auth-ds",
-                    "type": "prometheus",
-                    "url": "https://prometheus.example.com",
-                    "jsonData": {},  # Empty jsonData
-                    "secureJsonData": {},  # Empty secureJsonData
-                }
-            ],
-        }
+        content = """
+            apiVersion: 1
+            datasources:
+            - name: empty-auth-ds
+              type: prometheus
+              url: https://prometheus.example.com
+              jsonData: {}  # Empty jsonData
+              secureJsonData: {}  # Empty secureJsonData
+        """
 
         self.create_test_yaml(content)
         datasources = self.config_loader.load_datasources()
@@ -381,17 +442,21 @@ class TestConfigLoader:
         assert ds.auth_header_value is None
 
 
-def test_get_config_loader() -> None:
+@pytest.mark.parametrize(
+    ("datasources_path", "expected"),
+    [
+        ("/custom/datasources.yaml", "/custom/datasources.yaml"),
+        (None, "/etc/grafana/provisioning/datasources/datasources.yaml"),
+    ],
+)
+def test_get_config_loader(
+    monkeypatch: pytest.MonkeyPatch, datasources_path: str | None, expected: str
+) -> None:
     """Test get_config_loader factory function."""
-    with patch.dict(
-        "os.environ", {"GRAFANA_DATASOURCES_PATH": "/custom/datasources.yaml"}
-    ):
-        config_loader = get_config_loader()
-        assert config_loader.datasources_file == Path("/custom/datasources.yaml")
-
-    # Test default path
-    with patch.dict("os.environ", {}, clear=True):
-        config_loader = get_config_loader()
-        assert config_loader.datasources_file == Path(
-            "/etc/grafana/provisioning/datasources/datasources.yaml"
-        )
+    if datasources_path is None:
+        monkeypatch.delenv("GRAFANA_DATASOURCES_PATH", raising=False)
+    else:
+        monkeypatch.setenv("GRAFANA_DATASOURCES_PATH", datasources_path)
+
+    config_loader = get_config_loader()
+    assert config_loader.datasources_file == Path(expected)
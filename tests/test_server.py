@@ -1,17 +1,19 @@
 """Tests for the FastMCP server implementation."""
 
 import json
-import tempfile
 from pathlib import Path
 from typing import Any
 from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
+import yaml
 from fastmcp import Client
+from starlette.types import Message, Receive, Scope, Send
 
-from proms_mcp.auth import AuthMode
+from proms_mcp.auth import AuthMode, OpenShiftUserVerifier
 from proms_mcp.config import PrometheusDataSource
 from proms_mcp.server import (
+    AuthShutdownMiddleware,
     get_app,
     initialize_server,
     mcp_access_log,
@@ -24,17 +26,10 @@ from proms_mcp.server import (
 class TestFastMCPServer:
     """Test the FastMCP server implementation."""
 
-    def setup_method(self) -> None:
-        """Setup test fixtures."""
-        # Create a temporary directory for test datasources
-        self.temp_dir = tempfile.mkdtemp()
-        self.temp_path = Path(self.temp_dir)
-
-    def teardown_method(self) -> None:
-        """Cleanup test fixtures."""
-        import shutil
-
-        shutil.rmtree(self.temp_dir)
+    @pytest.fixture(autouse=True)
+    def setup_temp_path(self, tmp_path: Path) -> None:
+        """Use a per-test temporary directory for test datasources."""
+        self.temp_path = tmp_path
 
     def create_test_datasource_config(self) -> str:
         """Create a test datasource configuration."""
@@ -53,14 +48,11 @@ class TestFastMCPServer:
         }
 
         config_file = self.temp_path / "datasources.yaml"
-        import yaml
-
         with open(config_file, "w") as f:
             yaml.dump(config_content, f)
 
         return str(self.temp_path)
 
-    @pytest.mark.asyncio
     async def test_server_initialization(self) -> None:
         """Test server initialization."""
         self.create_test_datasource_config()
@@ -88,7 +80,6 @@ class TestFastMCPServer:
 
             mock_config.load_datasources.assert_called_once()
 
-    @pytest.mark.asyncio
     async def test_list_tools(self) -> None:
         """Test that all 8 tools are registered."""
         with patch("proms_mcp.server.get_auth_mode") as mock_get_auth_mode:
@@ -114,7 +105,6 @@ class TestFastMCPServer:
         for expected_tool in expected_tools:
             assert expected_tool in tool_names
 
-    @pytest.mark.asyncio
     async def test_list_datasources_tool(self) -> None:
         """Test the list_datasources tool."""
         with patch("proms_mcp.server.config_loader") as mock_config:
@@ -138,7 +128,6 @@ class TestFastMCPServer:
             assert response_data["data"][0]["id"] == "test-prometheus"
             assert response_data["data"][0]["url"] == "https://prometheus.example.com"
 
-    @pytest.mark.asyncio
     async def test_query_instant_tool(self) -> None:
         """Test the query_instant tool."""
         with patch("proms_mcp.server.config_loader") as mock_config:
@@ -170,7 +159,6 @@ class TestFastMCPServer:
                 assert response_data["query"] == "up"
                 assert "data" in response_data
 
-    @pytest.mark.asyncio
     async def test_query_range_tool(self) -> None:
         """Test the query_range tool."""
         with patch("proms_mcp.server.config_loader") as mock_config:
@@ -207,7 +195,6 @@ class TestFastMCPServer:
                 assert response_data["datasource"] == "test-prometheus"
                 assert response_data["query"] == "up"
 
-    @pytest.mark.asyncio
     async def test_tool_error_handling(self) -> None:
         """Test error handling in tools."""
         with patch("proms_mcp.server.config_loader") as mock_config:
@@ -257,7 +244,6 @@ class TestFastMCPServer:
 
     # NEW COMPREHENSIVE TESTS FOR MISSING COVERAGE
 
-    @pytest.mark.asyncio
     async def test_list_metrics_tool(self) -> None:
         """Test the list_metrics tool."""
         with patch("proms_mcp.server.config_loader") as mock_config:
@@ -286,7 +272,6 @@ class TestFastMCPServer:
                 assert response_data["datasource"] == "test-prometheus"
                 assert len(response_data["data"]) == 3
 
-    @pytest.mark.asyncio
     async def test_list_metrics_tool_error(self) -> None:
         """Test the list_metrics tool with error."""
         with patch("proms_mcp.server.config_loader") as mock_config:
@@ -314,7 +299,6 @@ class TestFastMCPServer:
                 assert response_data["status"] == "error"
                 assert "Connection failed" in response_data["error"]
 
-    @pytest.mark.asyncio
     async def test_get_metric_metadata_tool(self) -> None:
         """Test the get_metric_metadata tool."""
         with patch("proms_mcp.server.config_loader") as mock_config:
@@ -343,7 +327,6 @@ class TestFastMCPServer:
                 assert response_data["status"] == "success"
                 assert response_data["datasource"] == "test-prometheus"
 
-    @pytest.mark.asyncio
     async def test_get_metric_labels_tool(self) -> None:
         """Test the get_metric_labels tool."""
         with patch("proms_mcp.server.config_loader") as mock_config:
@@ -389,7 +372,6 @@ class TestFastMCPServer:
                 assert "instance" in response_data["data"]
                 assert "__name__" not in response_data["data"]
 
-    @pytest.mark.asyncio
     async def test_get_label_values_tool(self) -> None:
         """Test the get_label_values tool."""
         with patch("proms_mcp.server.config_loader") as mock_config:
@@ -418,7 +400,6 @@ class TestFastMCPServer:
                 assert response_data["status"] == "success"
                 assert response_data["datasource"] == "test-prometheus"
 
-    @pytest.mark.asyncio
     async def test_find_metrics_by_pattern_tool(self) -> None:
         """Test the find_metrics_by_pattern tool."""
         with patch("proms_mcp.server.config_loader") as mock_config:
@@ -451,7 +432,6 @@ class TestFastMCPServer:
                 assert "cpu_usage" in response_data["data"]
                 assert "up" not in response_data["data"]
 
-    @pytest.mark.asyncio
     async def test_find_metrics_by_pattern_invalid_regex(self) -> None:
         """Test find_metrics_by_pattern with invalid regex."""
         with patch("proms_mcp.server.config_loader") as mock_config:
@@ -548,7 +528,6 @@ class TestFastMCPServer:
         # Verify metrics were updated
         assert metrics_data["tool_requests_total"]["test_tool"]["success"] > 0
 
-    @pytest.mark.asyncio
     async def test_tool_error_handler_decorator(self) -> None:
         """Test the tool_error_handler decorator."""
 
@@ -588,7 +567,6 @@ class TestFastMCPServer:
 class TestFastMCPIntegration:
     """Integration tests for FastMCP server."""
 
-    @pytest.mark.asyncio
     async def test_server_can_start(self) -> None:
         """Test that the server can be initialized without errors."""
         with (
@@ -666,6 +644,44 @@ class TestFastMCPIntegration:
                 # Should not raise exception, just log and exit gracefully
                 main()
 
+    def test_server_main_closes_auth_provider_on_shutdown(self) -> None:
+        """Test that main wires the verifier into the shutdown middleware."""
+        from proms_mcp.server import main
+
+        verifier = OpenShiftUserVerifier(api_url="https://api.example.com:6443")
+        with patch("proms_mcp.server.start_health_metrics_server"):
+            with patch("proms_mcp.server.app") as mock_app:
+                mock_app.auth = verifier
+                mock_app.run = Mock()
+
+                main()
+
+        (middleware,) = mock_app.run.call_args.kwargs["middleware"]
+        assert middleware.cls is AuthShutdownMiddleware
+        assert middleware.args == (verifier,)
+
+    async def test_auth_shutdown_middleware(self) -> None:
+        """Test that the verifier is closed before lifespan shutdown completes."""
+        verifier = Mock(aclose=AsyncMock())
+        sent: list[Message] = []
+
+        async def inner_app(scope: Scope, receive: Receive, send: Send) -> None:
+            await send({"type": "lifespan.startup.complete"})
+            verifier.aclose.assert_not_awaited()
+            await send({"type": "lifespan.shutdown.complete"})
+
+        async def send(message: Message) -> None:
+            sent.append(message)
+
+        middleware = AuthShutdownMiddleware(inner_app, verifier)
+        await middleware({"type": "lifespan"}, AsyncMock(), send)
+
+        verifier.aclose.assert_awaited_once()
+        assert [m["type"] for m in sent] == [
+            "lifespan.startup.complete",
+            "lifespan.shutdown.complete",
+        ]
+
     def test_server_initialization_with_datasources(self) -> None:
         """Test server initialization with multiple datasources."""
         with (
@@ -744,7 +760,6 @@ class TestFastMCPIntegration:
                     stateless_http=True,
                 )
 
-    @pytest.mark.asyncio
     async def test_list_datasources_with_no_config_loader(self) -> None:
         """Test list_datasources when config_loader is None."""
         with patch("proms_mcp.server.config_loader", None):
@@ -755,7 +770,6 @@ class TestFastMCPIntegration:
             assert data["status"] == "error"
             assert "not initialized" in data["error"]
 
-    @pytest.mark.asyncio
     async def test_server_ready_state(self) -> None:
         """Test server ready state management."""
         from proms_mcp.server import server_ready
@@ -787,7 +801,6 @@ class TestFastMCPIntegration:
 
         assert isinstance(metrics_data["server_start_time"], float)
 
-    @pytest.mark.asyncio
     async def test_tool_with_missing_optional_parameter(self) -> None:
         """Test tools handle missing optional parameters correctly."""
         with patch("proms_mcp.server.config_loader") as mock_config:
@@ -817,7 +830,6 @@ class TestFastMCPIntegration:
                 assert response_data["status"] == "success"
                 assert response_data["datasource"] == "test-prometheus"
 
-    @pytest.mark.asyncio
     async def test_query_instant_with_optional_time(self) -> None:
         """Test query_instant with optional time parameter."""
         with patch("proms_mcp.server.config_loader") as mock_config:
@@ -849,7 +861,6 @@ class TestFastMCPIntegration:
                 # Verify client was called with None for time
                 mock_client.query_instant.assert_called_with("up", None)
 
-    @pytest.mark.asyncio
     async def test_async_tool_error_handler_decorator(self) -> None:
         """Test the tool_error_handler decorator with async functions."""
 
@@ -886,7 +897,6 @@ class TestFastMCPIntegration:
             assert result["status"] == "error"
             assert "not initialized" in result["error"]
 
-    @pytest.mark.asyncio
     async def test_mcp_access_log_decorator_async(self) -> None:
         """Test the mcp_access_log decorator with async functions."""
 
@@ -912,7 +922,6 @@ class TestFastMCPIntegration:
         # Verify error metrics were updated
         assert metrics_data["tool_requests_total"]["async_error_tool"]["error"] > 0
 
-    @pytest.mark.asyncio
     async def test_all_tools_error_handling(self) -> None:
         """Test error handling for all MCP tools when datasource fails."""
         with patch("proms_mcp.server.config_loader") as mock_config: